@@ -0,0 +1 @@
+"""Medições de tempo das rotinas de `markov`, sem Streamlit: `python -m benchmarks --help`."""
@@ -0,0 +1,131 @@
+import argparse
+import datetime
+import itertools
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.casos import CASOS
+
+
+# ---------------------------------------------------------
+# MEDIÇÃO
+# ---------------------------------------------------------
+def medir(funcao, repeticoes):
+    """Tempos (s) de `repeticoes` execuções de `funcao`, depois de uma de aquecimento."""
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def rodar(args):
+    resultados = []
+    grade = itertools.product(args.casos, args.m, args.K, args.n)
+
+    for caso, m, K, n in grade:
+        if caso == "ordem_1" and K != args.K[0]:
+            continue  # não depende de K
+
+        rng = np.random.default_rng(args.semente)
+        variantes = CASOS[caso](m, K, n, rng)
+
+        for variante, funcao in variantes.items():
+            if variante == "referencia" and (args.sem_referencia or n > args.n_max_referencia):
+                continue
+
+            tempos = medir(funcao, args.repeticoes)
+            resultado = {
+                "caso": caso, "variante": variante, "m": m,
+                "K": 1 if caso == "ordem_1" else K, "n": n,
+                "mediana": float(np.median(tempos)), "minimo": min(tempos),
+                "repeticoes": args.repeticoes,
+            }
+            resultados.append(resultado)
+            print(f"{caso:20s} {variante:10s} m={m:<3d} K={resultado['K']:<2d} n={n:<9d} "
+                  f"{resultado['mediana'] * 1e3:10.2f} ms", flush=True)
+
+    saida = {
+        "data": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "resultados": resultados,
+    }
+    with open(args.saida, "w") as arquivo:
+        json.dump(saida, arquivo, indent=1)
+    print(f"Resultados gravados em {args.saida}")
+
+
+# ---------------------------------------------------------
+# COMPARAÇÃO COM UMA LINHA DE BASE
+# ---------------------------------------------------------
+def _chave(r):
+    return (r["caso"], r["variante"], r["m"], r["K"], r["n"])
+
+
+def comparar(args):
+    with open(args.base) as arquivo:
+        base = {_chave(r): r for r in json.load(arquivo)["resultados"]}
+    with open(args.novo) as arquivo:
+        novo = json.load(arquivo)["resultados"]
+
+    regressoes = 0
+    for r in novo:
+        anterior = base.get(_chave(r))
+        if anterior is None:
+            continue
+
+        razao = r["mediana"] / anterior["mediana"]
+        marca = ""
+        if razao > 1 + args.tolerancia:
+            marca = "  <-- REGRESSÃO"
+            regressoes += 1
+
+        caso, variante, m, K, n = _chave(r)
+        print(f"{caso:20s} {variante:10s} m={m:<3d} K={K:<2d} n={n:<9d} "
+              f"{anterior['mediana'] * 1e3:10.2f} -> {r['mediana'] * 1e3:10.2f} ms "
+              f"({razao:5.2f}x){marca}")
+
+    print(f"{regressoes} regressão(ões) acima de {args.tolerancia:.0%}")
+    return 1 if regressoes else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                     description="Tempos de simulação, contagem e teste de ordem.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+
+    p = sub.add_parser("rodar", help="mede os casos numa grade de m, K e n")
+    p.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    p.add_argument("--m", nargs="+", type=int, default=[2, 4])
+    p.add_argument("--K", nargs="+", type=int, default=[1, 3])
+    p.add_argument("--n", nargs="+", type=int, default=[1_000, 100_000])
+    p.add_argument("--repeticoes", type=int, default=5)
+    p.add_argument("--semente", type=int, default=0)
+    p.add_argument("--sem-referencia", action="store_true",
+                   help="não mede os loops originais das páginas")
+    p.add_argument("--n-max-referencia", type=int, default=20_000,
+                   help="maior n em que os loops originais são medidos")
+    p.add_argument("--saida", default="benchmarks.json")
+
+    c = sub.add_parser("comparar", help="aponta regressões em relação a uma linha de base")
+    c.add_argument("base")
+    c.add_argument("novo")
+    c.add_argument("--tolerancia", type=float, default=0.2,
+                   help="aumento relativo da mediana aceito antes de acusar regressão")
+
+    args = parser.parse_args(argv)
+    if args.comando == "rodar":
+        rodar(args)
+        return 0
+    return comparar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
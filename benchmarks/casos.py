@@ -0,0 +1,82 @@
+import numpy as np
+
+from benchmarks import referencias
+from markov.contagem import log_verossimilhanca_markov
+from markov.contextos import tabela_de_arvore, tabela_para_arvore, tabela_para_dicionario
+from markov.ordem import teste_razao_verossimilhanca_ordem
+from markov.simulacao import rotulos, simular_ordem_1, simular_ordem_K
+
+# ---------------------------------------------------------
+# CASOS MEDIDOS
+# ---------------------------------------------------------
+# Cada caso recebe (m, K, n, rng) e devolve {variante: função sem argumentos}. A
+# variante "referencia" é o loop original das páginas; as demais são as rotinas de
+# `markov`. Os dados de entrada são sorteados antes, fora da medição.
+
+def _dados(m, K, rng):
+    estados = [f"S{i}" for i in range(m)]
+    Q = rng.dirichlet(np.ones(m), size=m ** K)
+    pi = np.ones(m) / m
+    return estados, Q, pi
+
+
+def _sequencia(m, K, n, rng):
+    estados, Q, pi = _dados(m, K, rng)
+    return rotulos(simular_ordem_K(Q, pi, n, rng), estados).tolist()
+
+
+def caso_ordem_1(m, K, n, rng):
+    estados, P, pi = _dados(m, 1, rng)
+    return {
+        "referencia": lambda: referencias.simular_ordem_1(estados, P, pi, n),
+        "acumulada": lambda: simular_ordem_1(P, pi, n, rng),
+        "alias": lambda: simular_ordem_1(P, pi, n, rng, metodo="alias"),
+    }
+
+
+def caso_ordem_K_dicionario(m, K, n, rng):
+    estados, Q, pi = _dados(m, K, rng)
+    dicionario = tabela_para_dicionario(Q, estados)
+    return {
+        "referencia": lambda: referencias.simular_dicionario(estados, dicionario, pi, K, n),
+        "acumulada": lambda: simular_ordem_K(Q, pi, n, rng),
+        "alias": lambda: simular_ordem_K(Q, pi, n, rng, metodo="alias"),
+    }
+
+
+def caso_ordem_K_arvore(m, K, n, rng):
+    estados, Q, pi = _dados(m, K, rng)
+    arvore = tabela_para_arvore(Q, estados)
+    # O que a página roda: a árvore volta a ser tabela densa e a tabela é simulada;
+    # a conversão entra na medição
+    return {
+        "referencia": lambda: referencias.simular_arvore(estados, arvore, pi, K, n),
+        "acumulada": lambda: simular_ordem_K(tabela_de_arvore(arvore, estados), pi, n, rng),
+        "alias": lambda: simular_ordem_K(tabela_de_arvore(arvore, estados), pi, n, rng, metodo="alias"),
+    }
+
+
+def caso_contagem(m, K, n, rng):
+    sequencia = _sequencia(m, K, n, rng)
+    return {
+        "referencia": lambda: referencias.log_verossimilhanca_markov(sequencia, K),
+        "vetorizada": lambda: log_verossimilhanca_markov(sequencia, K),
+    }
+
+
+def caso_teste_rv(m, K, n, rng):
+    # alpha = 1 faz o teste varrer todas as ordens de 0 a K + 1
+    sequencia = _sequencia(m, K, n, rng)
+    return {
+        "referencia": lambda: referencias.teste_razao_verossimilhanca_ordem(sequencia, 0, K + 1, 1.0),
+        "vetorizada": lambda: teste_razao_verossimilhanca_ordem(sequencia, 0, K + 1, 1.0),
+    }
+
+
+CASOS = {
+    "ordem_1": caso_ordem_1,
+    "ordem_K_dicionario": caso_ordem_K_dicionario,
+    "ordem_K_arvore": caso_ordem_K_arvore,
+    "contagem": caso_contagem,
+    "teste_rv": caso_teste_rv,
+}
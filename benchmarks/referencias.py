@@ -0,0 +1,102 @@
+import math
+
+import numpy as np
+from scipy.stats import chi2
+
+# ---------------------------------------------------------
+# VERSÕES ORIGINAIS DAS PÁGINAS
+# ---------------------------------------------------------
+# Os loops abaixo são os mesmos ensinados nas páginas 01 a 03 (listas de rótulos,
+# np.random.choice a cada passo e dicionários de contagens). Servem de linha de
+# base para as medições: o ganho das rotinas de `markov` é medido contra eles.
+
+def simular_ordem_1(estados, P, pi, T):
+    X = []
+    X.append(np.random.choice(estados, p=pi))  # primeiro estado
+
+    for t in range(1, T):
+        estado_atual = X[-1]
+        i = estados.index(estado_atual)
+        proximo = np.random.choice(estados, p=P[i])
+        X.append(proximo)
+
+    return X
+
+
+def simular_dicionario(estados, dicionario, pi, K, T):
+    X = [np.random.choice(estados, p=pi) for _ in range(K)]
+
+    for t in range(K, T):
+        contexto = tuple(X[-K:])
+        probs = dicionario[contexto]
+        proximo = np.random.choice(estados, p=probs)
+        X.append(proximo)
+
+    return X
+
+
+def simular_arvore(estados, arvore, pi, K, T):
+    X = [np.random.choice(estados, p=pi) for _ in range(K)]
+
+    for t in range(K, T):
+        # arvore[a][b][c] da página 02, para qualquer K
+        probs = arvore
+        for s in X[-K:]:
+            probs = probs[s]
+        proximo = np.random.choice(estados, p=probs)
+        X.append(proximo)
+
+    return X
+
+
+def log_verossimilhanca_markov(sequencia, k):
+
+    # Calcula contagens
+    contagens_transicao = {}
+    total_contexto = {}
+
+    for t in range(k, len(sequencia)):
+        contexto = tuple(sequencia[t - k:t])
+        proximo_estado = sequencia[t]
+
+        if contexto not in contagens_transicao:
+            contagens_transicao[contexto] = {}
+            total_contexto[contexto] = 0
+
+        contagens_transicao[contexto][proximo_estado] = (
+            contagens_transicao[contexto].get(proximo_estado, 0) + 1
+        )
+        total_contexto[contexto] += 1
+
+    # Calcula log-verossimilhança
+    ell = 0.0
+    for contexto, contagens in contagens_transicao.items():
+        Nk_c = total_contexto[contexto]
+
+        for Nk_ca in contagens.values():
+            ell += Nk_ca * math.log(Nk_ca / Nk_c)
+
+    return ell
+
+
+def teste_razao_verossimilhanca_ordem(sequencia, k_min, k_max, alpha):
+    estados = list(set(sequencia))
+    m = len(estados)
+
+    resultados = []
+
+    for k in range(k_min, k_max):
+
+        ell_k = log_verossimilhanca_markov(sequencia, k)
+        ell_k1 = log_verossimilhanca_markov(sequencia, k + 1)
+
+        LR = 2 * (ell_k1 - ell_k)
+        df = ((m - 1) * (m ** (k + 1)) - ((m - 1) * (m ** k)))
+        p_value = 1 - chi2.cdf(LR, df=df)
+
+        resultados.append({"k_testado": k + 1, "LR": LR, "df": df, "p_value": p_value})
+
+        if p_value >= alpha:
+            return {"ordem_escolhida": k, "resultados": resultados}
+
+    return {"ordem_escolhida": k_max, "resultados": resultados}
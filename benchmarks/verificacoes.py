@@ -0,0 +1,166 @@
+import argparse
+import itertools
+import sys
+
+import numpy as np
+from scipy.special import gammaln, logsumexp
+
+from markov.bct import beta_padrao, ctw
+from markov.sufixos import IndiceSufixos, _lcp_vizinhos, _ordenar_sufixos
+
+# ---------------------------------------------------------
+# VERIFICAÇÕES POR FORÇA BRUTA
+# ---------------------------------------------------------
+# Compara as rotinas de `markov` com versões ingênuas, em entradas pequenas o
+# bastante para a força bruta: `python -m benchmarks.verificacoes`. Cada
+# verificação recebe um rng, levanta AssertionError na primeira divergência e
+# devolve o número de entradas conferidas.
+
+
+# ---------------------------------------------------------
+# ÍNDICE DE SUFIXOS
+# ---------------------------------------------------------
+def _sequencias_sufixos(rng):
+    # Casos de borda, sequências periódicas e aleatórias; (x, m)
+    yield np.array([], dtype=np.int64), 2
+    yield np.array([1]), 2
+    yield np.array([0, 0]), 2
+    yield np.array([1, 0]), 2
+    yield np.zeros(17, dtype=np.int64), 2
+    yield np.tile([0, 1, 2], 11), 3
+    yield np.tile([1, 0, 0, 1], 9)[:-1], 2
+    yield rng.integers(0, 300, 40), 300  # códigos que não cabem num byte
+    for m in (2, 3, 5):
+        for n in (3, 10, 50, 120):
+            yield rng.integers(0, m, n), m
+
+
+def verificar_sufixos(rng):
+    """Array de sufixos, LCP e contagens de `IndiceSufixos` contra a força bruta."""
+    conferidas = 0
+
+    for x, m in _sequencias_sufixos(rng):
+        n = len(x)
+        lista = x.tolist()
+
+        sa = sorted(range(n), key=lambda i: lista[i:])
+        lcp = []
+        for a, b in zip(sa, sa[1:]):
+            h = 0
+            while a + h < n and b + h < n and lista[a + h] == lista[b + h]:
+                h += 1
+            lcp.append(h)
+
+        if n:
+            assert _ordenar_sufixos(x).tolist() == sa, f"array de sufixos errado para {lista}"
+            assert _lcp_vizinhos(x, np.array(sa)).tolist() == lcp, f"LCP errado para {lista}"
+
+        indice = IndiceSufixos(x, m)
+        assert indice.sa.tolist() == sa and indice.lcp.tolist() == lcp
+
+        # Contagens de todos os contextos de tamanho até 3 (e de alguns ausentes)
+        for tamanho in range(0, min(n, 3) + 1):
+            # Uma ocorrência por posição inicial 0..n-1 (o contexto vazio ocorre n vezes)
+            pedacos = [tuple(lista[i:i + tamanho]) for i in range(min(n, n - tamanho + 1))]
+            contextos = set(pedacos) | {(m - 1,) * tamanho, (0,) * tamanho}
+            for c in contextos:
+                seguidos = [lista[i + tamanho] for i in range(n - tamanho) if tuple(lista[i:i + tamanho]) == c]
+                assert indice.ocorrencias(c) == pedacos.count(c), (lista, c)
+                assert indice.N_c(c) == len(seguidos), (lista, c)
+                assert indice.contagens(c).tolist() == [seguidos.count(a) for a in range(m)], (lista, c)
+
+            if tamanho:
+                for t in (1, 2, 3):
+                    esperado = sorted((c, pedacos.count(c)) for c in set(pedacos) if pedacos.count(c) >= t)
+                    assert sorted(indice.contextos_frequentes(t, tamanho)) == esperado, (lista, t, tamanho)
+
+        conferidas += 1
+
+    return conferidas
+
+
+# ---------------------------------------------------------
+# CTW E BCTW
+# ---------------------------------------------------------
+def _arvores(x, m, D, d, s, beta, alpha):
+    # Todas as árvores completas abaixo do nó s (do estado mais recente ao mais
+    # antigo), como (log priori, log verossimilhança, folhas). Na priori BCT um nó
+    # de profundidade < D é folha com probabilidade β; os de profundidade D sempre são.
+    N = np.zeros(m)
+    for t in range(D, len(x)):
+        if tuple(x[t - i] for i in range(1, d + 1)) == s:
+            N[x[t]] += 1
+    log_pe = gammaln(m * alpha) - gammaln(N.sum() + m * alpha) + (gammaln(N + alpha) - gammaln(alpha)).sum()
+
+    if d == D:
+        return [(0.0, log_pe, [s])]
+
+    arvores = [(np.log(beta), log_pe, [s])]
+    subarvores = [_arvores(x, m, D, d + 1, s + (j,), beta, alpha) for j in range(m)]
+    for combinacao in itertools.product(*subarvores):
+        arvores.append((np.log1p(-beta) + sum(a[0] for a in combinacao),
+                        sum(a[1] for a in combinacao),
+                        [folha for a in combinacao for folha in a[2]]))
+    return arvores
+
+
+def verificar_ctw(rng):
+    """Verossimilhança marginal e árvore MAP de `ctw` contra a soma sobre todas as árvores."""
+    conferidas = 0
+    casos = [(2, 3, n) for n in (2, 3, 30, 200)] + [(3, 2, n) for n in (1, 40, 150)] + [(2, 4, 80), (4, 1, 60)]
+
+    for m, D, n in casos:
+        for beta, alpha in ((None, 0.5), (0.3, 1.0), (0.9, 0.2)):
+            # Sequências de ordem 1 ou 2 (árvore MAP não trivial) e i.i.d.
+            Q = rng.dirichlet(np.full(m, 0.3), size=m ** min(D, 2))
+            x = list(rng.integers(0, m, min(D, 2)))
+            while len(x) < n:
+                x.append(int(rng.choice(m, p=Q[sum(s * m ** i for i, s in enumerate(x[-min(D, 2):]))])))
+            x = np.array(x[:n], dtype=np.int64)
+
+            r = ctw(x, m, D, beta, alpha)
+            b = beta_padrao(m) if beta is None else beta
+            arvores = _arvores(x.tolist(), m, D, 0, (), b, alpha)
+            log_post = np.array([a[0] + a[1] for a in arvores])
+
+            assert np.isclose(r["log_verossimilhanca_marginal"], logsumexp(log_post)), (m, D, n, beta, alpha)
+            assert np.isclose(r["log_prob_map"], log_post.max()), (m, D, n, beta, alpha)
+            assert np.isclose(r["posteriori_map"], np.exp(log_post.max() - logsumexp(log_post)))
+
+            # A árvore MAP só é comparada quando não há empate
+            ordem = np.sort(log_post)
+            if len(ordem) == 1 or ordem[-1] - ordem[-2] > 1e-9:
+                folhas = arvores[int(log_post.argmax())][2]
+                assert sorted(r["arvore_map"].contextos) == sorted(tuple(reversed(s)) for s in folhas), \
+                    (m, D, n, beta, alpha)
+
+            conferidas += 1
+
+    return conferidas
+
+
+VERIFICACOES = {
+    "sufixos": verificar_sufixos,
+    "ctw": verificar_ctw,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.verificacoes",
+                                     description="Confere as rotinas de `markov` com a força bruta.")
+    parser.add_argument("verificacoes", nargs="*", metavar="verificacao",
+                        help=f"entre {', '.join(VERIFICACOES)} (padrão: todas)")
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+    for nome in args.verificacoes:
+        if nome not in VERIFICACOES:
+            parser.error(f"verificação desconhecida: {nome}")
+
+    for nome in args.verificacoes or VERIFICACOES:
+        conferidas = VERIFICACOES[nome](np.random.default_rng(args.semente))
+        print(f"{nome:10s} ok ({conferidas} entradas)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
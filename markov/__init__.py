@@ -0,0 +1 @@
+"""Rotinas numéricas para cadeias de Markov usadas pelas páginas do app."""
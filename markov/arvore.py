@@ -0,0 +1,97 @@
+import numpy as np
+
+
+# ---------------------------------------------------------
+# ÁRVORE DE CONTEXTOS ESPARSA
+# ---------------------------------------------------------
+# Ao contrário do dicionário com todos os m^K contextos, aqui só existem as folhas
+# da árvore: contextos de tamanhos diferentes, como nas árvores de contexto
+# bayesianas. Os contextos são tuplas de códigos na ordem das páginas (do estado
+# mais antigo ao mais recente), mas a árvore é percorrida a partir do estado mais
+# recente: a raiz olha x_{t-1}, o nível seguinte olha x_{t-2}, e assim por diante.
+#
+# Cada nó interno é uma linha de `filhos` (n_internos x m). Um valor >= 0 aponta
+# para outro nó interno; um valor negativo -(f + 1) aponta para a folha f, cuja
+# distribuição do próximo estado está em `probs[f]`.
+#
+# Só para uso como biblioteca: as páginas editam e simulam a tabela densa m^K x m.
+
+class ArvoreContextos:
+    """Árvore de contextos de tamanho variável que guarda apenas as folhas."""
+
+    def __init__(self, folhas, m):
+        """
+        `folhas` é um dicionário {contexto: probabilidades}, com contextos como
+        tuplas de códigos 0..m-1. A árvore precisa ser completa: todo histórico
+        tem de terminar em exatamente uma folha.
+        """
+        self.m = m
+        self.contextos = [tuple(int(s) for s in ctx) for ctx in folhas]
+
+        probs = np.array([folhas[ctx] for ctx in folhas], dtype=float).reshape(len(folhas), m)
+        if (probs.sum(axis=1) == 0).any():
+            raise ValueError("As probabilidades de uma folha não podem somar zero.")
+        self.probs = probs / probs.sum(axis=1, keepdims=True)
+
+        # Raiz como folha: cadeia de ordem 0
+        if self.contextos == [()]:
+            self.filhos = np.empty((0, m), dtype=np.int64)
+            self.profundidade = 0
+            return
+
+        filhos = [[None] * m]
+        for f, ctx in enumerate(self.contextos):
+            if len(ctx) == 0:
+                raise ValueError("O contexto vazio só pode ser folha de uma árvore de uma folha.")
+
+            no = 0
+            for d, s in enumerate(reversed(ctx)):
+                atual = filhos[no][s]
+                ultimo = d == len(ctx) - 1
+
+                if ultimo:
+                    if atual is not None:
+                        raise ValueError(f"Contexto {ctx} repetido ou sufixo de outro contexto.")
+                    filhos[no][s] = -(f + 1)
+                elif atual is None:
+                    filhos.append([None] * m)
+                    filhos[no][s] = len(filhos) - 1
+                    no = len(filhos) - 1
+                elif atual < 0:
+                    raise ValueError(f"Contexto {ctx} estende outra folha da árvore.")
+                else:
+                    no = atual
+
+        if any(filho is None for linha in filhos for filho in linha):
+            raise ValueError("A árvore está incompleta: há históricos sem contexto.")
+
+        self.filhos = np.array(filhos, dtype=np.int64)
+        self.profundidade = max(len(ctx) for ctx in self.contextos)
+
+    @classmethod
+    def de_dicionario(cls, dicionario, estados):
+        """Árvore a partir de {contexto com nomes de estados: probabilidades}."""
+        indice = {estado: i for i, estado in enumerate(estados)}
+        folhas = {tuple(indice[s] for s in ctx): p for ctx, p in dicionario.items()}
+        return cls(folhas, len(estados))
+
+    def para_dicionario(self, estados):
+        """Dicionário {contexto com nomes de estados: probabilidades} das folhas."""
+        return {tuple(estados[s] for s in ctx): self.probs[f] for f, ctx in enumerate(self.contextos)}
+
+    @property
+    def n_folhas(self):
+        return len(self.contextos)
+
+    def folha(self, historico):
+        """Índice da folha do histórico (sequência de códigos, o mais recente no fim)."""
+        no = 0 if len(self.filhos) else -1
+        d = 1
+        while no >= 0:
+            no = self.filhos[no, historico[-d]]
+            d += 1
+        return -no - 1
+
+    def probabilidades(self, historico):
+        """Distribuição do próximo estado dado o histórico, em O(profundidade)."""
+        return self.probs[self.folha(historico)]
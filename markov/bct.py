@@ -0,0 +1,225 @@
+import itertools
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.special import gammaln
+
+from markov.arvore import ArvoreContextos
+from markov.paralelo import mapear
+
+
+# ---------------------------------------------------------
+# ÁRVORE DE CONTAGENS
+# ---------------------------------------------------------
+# Para as árvores de contexto bayesianas (BCT), cada nó s de profundidade d é um
+# contexto lido do estado mais recente para o mais antigo: s = (x_{t-1}, ..., x_{t-d}).
+# Aqui ele vira o inteiro Σ_i x_{t-i} m^{i-1} (estado mais recente no dígito menos
+# significativo), de modo que o pai de um nó de profundidade d+1 é o seu código
+# módulo m^d. Só os nós que aparecem na sequência são guardados, profundidade a
+# profundidade, em ordem crescente de código.
+
+def beta_padrao(m):
+    """Valor de β sugerido para as BCT: 1 − 2^{−m+1}."""
+    return 1.0 - 2.0 ** (-m + 1)
+
+
+class ArvoreContagens:
+    """Contagens N_s(a) de todos os contextos observados até a profundidade D."""
+
+    def __init__(self, x, m, D):
+        if m ** (D + 1) >= 2 ** 62:
+            raise ValueError(f"m^(D+1) = {m}^{D + 1} não cabe nos códigos inteiros de 64 bits.")
+
+        x = np.asarray(x, dtype=np.int64)
+        self.m = m
+        self.D = D
+        n = len(x) - D  # as D primeiras posições ficam como condição inicial
+
+        # Contexto de profundidade D de cada posição t = D..len(x)-1
+        codigo = np.zeros(max(n, 0), dtype=np.int64)
+        for i in range(1, D + 1):
+            codigo += x[D - i:D - i + n] * m ** (i - 1)
+
+        chave = codigo * m + x[D:]
+        chaves, contagens = np.unique(chave, return_counts=True)
+        nos, inverso = np.unique(chaves // m, return_inverse=True)
+
+        N = np.zeros((len(nos), m), dtype=np.int64)
+        np.add.at(N, (inverso, chaves % m), contagens)
+
+        self.codigos = [None] * (D + 1)
+        self.N = [None] * (D + 1)
+        self.pai = [None] * (D + 1)  # índice do pai, na profundidade d-1, de cada nó
+        self.codigos[D], self.N[D] = nos, N
+
+        for d in range(D - 1, -1, -1):
+            nos, inverso = np.unique(self.codigos[d + 1] % m ** d, return_inverse=True)
+            N = np.zeros((len(nos), m), dtype=np.int64)
+            np.add.at(N, inverso, self.N[d + 1])
+            self.codigos[d], self.N[d], self.pai[d + 1] = nos, N, inverso
+
+    def contexto(self, d, codigo):
+        """Contexto (do estado mais antigo ao mais recente) de um código de profundidade d."""
+        recente_primeiro = [(codigo // self.m ** i) % self.m for i in range(d)]
+        return tuple(int(s) for s in reversed(recente_primeiro))
+
+    # -----------------------------------------------------
+    # ESTIMADOR DE DIRICHLET NAS FOLHAS
+    # -----------------------------------------------------
+    def log_pe(self, d, alpha=0.5):
+        """log P_e(s) de cada nó com priori Dirichlet(α, ..., α) (α = 1/2: KT)."""
+        N = self.N[d]
+        m = self.m
+        return (gammaln(m * alpha) - gammaln(N.sum(axis=1) + m * alpha)
+                + (gammaln(N + alpha) - gammaln(alpha)).sum(axis=1))
+
+    # -----------------------------------------------------
+    # CTW E BCTW
+    # -----------------------------------------------------
+    def _recursao(self, beta, alpha):
+        # Percorre as profundidades de D até 0, como no CTW:
+        #   P_w(s) = β P_e(s) + (1 − β) Π_j P_w(sj)
+        #   P_m(s) = max(β P_e(s), (1 − β) Π_j P_m(sj))
+        # Filhos que não aparecem na sequência têm P_w = 1; para P_m, o valor de uma
+        # subárvore sem dados depende só da profundidade (log_u abaixo).
+        m, D = self.m, self.D
+        log_b, log_1b = np.log(beta), np.log1p(-beta)
+
+        log_u = np.zeros(D + 1)
+        for d in range(D - 1, -1, -1):
+            log_u[d] = max(log_b, log_1b + m * log_u[d + 1])
+
+        log_pe = [self.log_pe(d, alpha) for d in range(D + 1)]
+        log_pw = [None] * (D + 1)
+        log_pm = [None] * (D + 1)
+        log_pw[D] = log_pe[D]
+        log_pm[D] = log_pe[D]
+
+        for d in range(D - 1, -1, -1):
+            n_nos = len(self.codigos[d])
+            pai = self.pai[d + 1]
+            n_filhos = np.bincount(pai, minlength=n_nos)
+
+            filhos_w = np.bincount(pai, weights=log_pw[d + 1], minlength=n_nos)
+            filhos_m = (np.bincount(pai, weights=log_pm[d + 1], minlength=n_nos)
+                        + (m - n_filhos) * log_u[d + 1])
+
+            log_pw[d] = np.logaddexp(log_b + log_pe[d], log_1b + filhos_w)
+            log_pm[d] = np.maximum(log_b + log_pe[d], log_1b + filhos_m)
+
+        return log_pe, log_pw, log_pm, log_u
+
+    def avaliar(self, beta=None, alpha=0.5):
+        """
+        Verossimilhança marginal (média das verossimilhanças de todas as árvores de
+        profundidade <= D, pesadas pela priori BCT) e árvore MAP, sem reler a sequência.
+        """
+        beta = beta_padrao(self.m) if beta is None else beta
+        log_pe, log_pw, log_pm, log_u = self._recursao(beta, alpha)
+
+        if not len(self.codigos[0]):  # sequência com até D estados
+            log_marginal, log_map = 0.0, float(log_u[0])
+        else:
+            log_marginal, log_map = float(log_pw[0][0]), float(log_pm[0][0])
+
+        folhas = self._folhas_map(beta, alpha, log_pe, log_pm, log_u)
+
+        return {
+            "log_verossimilhanca_marginal": log_marginal,
+            "log_prob_map": log_map,
+            "posteriori_map": float(np.exp(log_map - log_marginal)),
+            "arvore_map": ArvoreContextos(folhas, self.m),
+        }
+
+    def _folhas_map(self, beta, alpha, log_pe, log_pm, log_u):
+        # Desce a partir da raiz: um nó vira folha quando β P_e(s) vence o produto
+        # dos filhos. As probabilidades das folhas são a média a posteriori
+        # (N_s(a) + α) / (M_s + mα).
+        m, D = self.m, self.D
+        log_b, log_1b = np.log(beta), np.log1p(-beta)
+        folhas = {}
+
+        def sem_dados(d, codigo):
+            if d == D or log_b >= log_1b + m * log_u[d + 1]:
+                folhas[self.contexto(d, codigo)] = np.full(m, 1.0 / m)
+                return
+            for j in range(m):
+                sem_dados(d + 1, codigo + j * m ** d)
+
+        def visitar(d, i):
+            codigo = int(self.codigos[d][i])
+            if d == D or log_pm[d][i] == log_b + log_pe[d][i]:
+                N = self.N[d][i]
+                folhas[self.contexto(d, codigo)] = (N + alpha) / (N.sum() + m * alpha)
+                return
+
+            codigos_filhos = self.codigos[d + 1]
+            for j in range(m):
+                filho = codigo + j * m ** d
+                k = np.searchsorted(codigos_filhos, filho)
+                if k < len(codigos_filhos) and codigos_filhos[k] == filho:
+                    visitar(d + 1, k)
+                else:
+                    sem_dados(d + 1, filho)
+
+        if len(self.codigos[0]):
+            visitar(0, 0)
+        else:
+            sem_dados(0, 0)
+
+        return folhas
+
+
+def ctw(x, m, D, beta=None, alpha=0.5):
+    """Atalho: `ArvoreContagens(x, m, D).avaliar(beta, alpha)`."""
+    return ArvoreContagens(x, m, D).avaliar(beta, alpha)
+
+
+# ---------------------------------------------------------
+# SENSIBILIDADE À PRIORI
+# ---------------------------------------------------------
+def _avaliar_prioris(tarefa):
+    arvore, prioris = tarefa
+    linhas = []
+
+    for beta, alpha in prioris:
+        r = arvore.avaliar(beta, alpha)
+        mapa = r["arvore_map"]
+        linhas.append({
+            "beta": beta,
+            "alpha": alpha,
+            "log_verossimilhanca_marginal": r["log_verossimilhanca_marginal"],
+            "log_prob_map": r["log_prob_map"],
+            "posteriori_map": r["posteriori_map"],
+            "n_folhas_map": mapa.n_folhas,
+            "profundidade_map": mapa.profundidade,
+            "contextos_map": tuple(sorted(mapa.contextos)),
+        })
+
+    return linhas
+
+
+def varrer_prioris(arvore, betas, alphas, n_processos=None):
+    """
+    Avalia a `ArvoreContagens` em todas as combinações de β (priori das árvores) e
+    α (concentração da Dirichlet nas folhas), sem reler a sequência.
+
+    A grade é dividida em um pedaço por processo, para que a árvore de contagens
+    seja enviada uma única vez a cada um (n_processos=None: todos os núcleos).
+    Devolve um DataFrame com uma linha por priori.
+    """
+    if n_processos is None:
+        n_processos = os.cpu_count() or 1
+
+    prioris = list(itertools.product(betas, alphas))
+    n_pedacos = max(1, min(n_processos, len(prioris)))
+    pedacos = [prioris[i::n_pedacos] for i in range(n_pedacos)]
+
+    linhas = [linha for parte in mapear(_avaliar_prioris, [(arvore, p) for p in pedacos], n_processos)
+              for linha in parte]
+
+    return (pd.DataFrame(linhas, columns=["beta", "alpha", "log_verossimilhanca_marginal",
+                                          "log_prob_map", "posteriori_map", "n_folhas_map",
+                                          "profundidade_map", "contextos_map"])
+            .sort_values(["beta", "alpha"], ignore_index=True))
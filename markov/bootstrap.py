@@ -0,0 +1,98 @@
+import numpy as np
+from scipy.stats import chi2
+
+from markov.contagem import (codificar, contar_ordens, contar_transicoes, estimar_transicoes,
+                             log_verossimilhanca_contagens, marginalizar_ordens)
+from markov.paralelo import dividir, mapear
+from markov.simulacao import simular_ordem_K_lote
+from markov.trajetoria import dtype_codigos
+
+# Memória de trabalho de cada lote (bytes), em cada processo
+MEMORIA_LOTE = 2 ** 28
+
+
+# ---------------------------------------------------------
+# BOOTSTRAP PARAMÉTRICO DO TESTE DE RAZÃO DE VEROSSIMILHANÇA
+# ---------------------------------------------------------
+# A aproximação qui-quadrado com (m−1)m^k graus de liberdade é ruim quando muitos
+# contextos têm poucas (ou nenhuma) observações. O bootstrap paramétrico simula
+# sequências do modelo de ordem k ajustado (H0), recalcula LR em cada uma e compara
+# o LR observado com essa distribuição.
+
+def ajustar_ordem_k(N_k, N_0):
+    """
+    Tabela (m^k x m) do EMV de ordem k para simular sob H0. Contextos não observados
+    recebem a distribuição marginal dos estados (EMV de ordem 0).
+    """
+    Q = estimar_transicoes(N_k)
+    marginal = N_0[0] / N_0[0].sum()
+    Q[N_k.sum(axis=1) == 0] = marginal
+    return Q, marginal
+
+
+def tamanho_lote_bootstrap(n, m, memoria_lote=MEMORIA_LOTE, maximo=64):
+    """
+    Réplicas por lote para sequências de tamanho n com m estados: o lote guarda
+    `dtype_codigos(m)` (1 ou 2 bytes) por passo de cada réplica, e a contagem de uma
+    réplica por vez usa uns 40 bytes por passo. Sempre pelo menos uma réplica.
+    """
+    por_replica = max(n * dtype_codigos(m).itemsize, 1)
+    return int(np.clip((memoria_lote - 40 * n) // por_replica, 1, maximo))
+
+
+def _estatisticas_lote(tarefa):
+    Q, pi, n, k, m, B, semente = tarefa
+    X = simular_ordem_K_lote(Q, pi, n, B, np.random.default_rng(semente), dtype=dtype_codigos(m))
+
+    # Uma contagem de ordem k+1 por réplica; a de ordem k sai por marginalização
+    LR = np.empty(B)
+    for b, x in enumerate(X):
+        N_k, N_k1 = marginalizar_ordens(contar_transicoes(x, k + 1, m), x[:k + 1], k + 1, m)[k:]
+        LR[b] = 2 * (log_verossimilhanca_contagens(N_k1) - log_verossimilhanca_contagens(N_k))
+    return LR
+
+
+def estatisticas_bootstrap(Q, pi, n, k, B, seed=None, n_processos=None, memoria_lote=MEMORIA_LOTE):
+    """
+    LR de B sequências de tamanho n simuladas de Q, repartidas entre processos.
+
+    As réplicas vão em lotes de `tamanho_lote_bootstrap(n, m, memoria_lote)`, cada um
+    com seu próprio gerador (SeedSequence.spawn), como em `simular_paralelo`: o
+    resultado não depende do número de processos, só de n e de `memoria_lote`.
+    """
+    m = Q.shape[1]
+    tamanhos = dividir(B, tamanho_lote_bootstrap(n, m, memoria_lote))
+    sementes = np.random.SeedSequence(seed).spawn(len(tamanhos))
+
+    tarefas = [(Q, pi, n, k, m, b, semente) for b, semente in zip(tamanhos, sementes)]
+    lotes = mapear(_estatisticas_lote, tarefas, n_processos)
+    return np.concatenate(lotes) if lotes else np.empty(0)
+
+
+def teste_razao_bootstrap(sequencia, k, B=999, estados=None, seed=None, n_processos=None,
+                          memoria_lote=MEMORIA_LOTE):
+    """
+    Teste de ordem k contra k+1 com p-valor qui-quadrado e p-valor bootstrap
+    (1 + #{LR_b >= LR}) / (B + 1).
+    """
+    x, estados = codificar(sequencia, estados)
+    m = len(estados)
+    return teste_bootstrap_contagens(x, m, contar_ordens(x, k + 1, m), k, B, seed, n_processos,
+                                     memoria_lote)
+
+
+def teste_bootstrap_contagens(x, m, N, k, B, seed=None, n_processos=None, memoria_lote=MEMORIA_LOTE):
+    """Mesmo teste, reaproveitando as tabelas N das ordens 0..k+1 já contadas de x."""
+    LR = 2 * (log_verossimilhanca_contagens(N[k + 1]) - log_verossimilhanca_contagens(N[k]))
+    df = ((m - 1) * (m ** (k + 1)) - ((m - 1) * (m ** k)))
+
+    Q, marginal = ajustar_ordem_k(N[k], N[0])
+    LR_b = estatisticas_bootstrap(Q, marginal, len(x), k, B, seed, n_processos, memoria_lote)
+
+    return {
+        "k_testado": k + 1,
+        "LR": LR,
+        "df": df,
+        "p_value": float(chi2.sf(LR, df=df)),
+        "p_value_bootstrap": float((1 + np.sum(LR_b >= LR)) / (B + 1)),
+    }
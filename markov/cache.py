@@ -0,0 +1,67 @@
+import streamlit as st
+
+from markov import graficos, instrumentacao
+from markov.n_passos import distancia_estacionaria, distribuicao_estacionaria, potencias_transicao
+from markov.simulacao import simular_ordem_K
+from markov.trajetoria import Trajetoria
+
+# ---------------------------------------------------------
+# CACHE DAS PÁGINAS
+# ---------------------------------------------------------
+# Cada rerun do Streamlit executa a página inteira. As funções abaixo guardam os
+# resultados pelas entradas relevantes (P ou Q, pi, T, semente, N), com no máximo
+# MAX_ENTRADAS resultados por função; os mais antigos são descartados primeiro.
+#
+# Com a instrumentação ligada, cada chamada é medida por fora do cache e cada
+# execução é contada por dentro, o que dá a taxa de acerto de cada função.
+
+MAX_ENTRADAS = 32
+
+# Uma `Trajetoria` entra na chave do cache pelos códigos e pela lista de estados
+_HASH_TRAJETORIA = {Trajetoria: lambda X: (X.codigos, tuple(X.estados))}
+
+
+@instrumentacao.medida("simulação", com_cache=True)
+@st.cache_data(max_entries=MAX_ENTRADAS, show_spinner=False)
+def simular(Q, pi, T, estados, semente, metodo="acumulada"):
+    """`Trajetoria` de ordem K, com K dado pelo formato de Q."""
+    instrumentacao.execucao("simulação")
+    return Trajetoria(simular_ordem_K(Q, pi, T, semente, metodo), estados)
+
+
+@instrumentacao.medida("potências", com_cache=True)
+@st.cache_data(max_entries=MAX_ENTRADAS, show_spinner=False)
+def potencias(P, N):
+    """P^1, ..., P^N; o slider de n passa a ser só uma consulta a este array."""
+    instrumentacao.execucao("potências")
+    return potencias_transicao(P, N)
+
+
+@instrumentacao.medida("convergência", com_cache=True)
+@st.cache_data(max_entries=MAX_ENTRADAS, show_spinner=False)
+def convergencia(P, N):
+    """Distribuição estacionária e distância de variação total d(n), n = 1..N."""
+    instrumentacao.execucao("convergência")
+    pi = distribuicao_estacionaria(P)
+    return pi, distancia_estacionaria(potencias(P, N), pi)
+
+
+@instrumentacao.medida("figura: trajetória", com_cache=True)
+@st.cache_data(max_entries=MAX_ENTRADAS, show_spinner=False, hash_funcs=_HASH_TRAJETORIA)
+def figura_trajetoria(X, titulo=" ", janela=None):
+    instrumentacao.execucao("figura: trajetória")
+    return graficos.figura_trajetoria(X, titulo, janela)
+
+
+@instrumentacao.medida("figura: convergência", com_cache=True)
+@st.cache_data(max_entries=MAX_ENTRADAS, show_spinner=False)
+def figura_convergencia(distancias, eps=0.25):
+    instrumentacao.execucao("figura: convergência")
+    return graficos.figura_convergencia(distancias, eps)
+
+
+@instrumentacao.medida("figura: matriz", com_cache=True)
+@st.cache_data(max_entries=MAX_ENTRADAS, show_spinner=False)
+def figura_matriz(M, estados, **opcoes):
+    instrumentacao.execucao("figura: matriz")
+    return graficos.figura_matriz(M, estados, **opcoes)
@@ -0,0 +1,221 @@
+import numpy as np
+
+
+# ---------------------------------------------------------
+# CODIFICAÇÃO DA SEQUÊNCIA
+# ---------------------------------------------------------
+def codificar(sequencia, estados=None):
+    """
+    Converte a sequência de estados em códigos inteiros 0..m-1.
+
+    Devolve (códigos, estados). Sem `estados`, usa os estados observados em ordem
+    crescente; com `estados`, o código é a posição na lista.
+    """
+    observados, inversos = np.unique(np.asarray(sequencia), return_inverse=True)
+    if estados is None:
+        return inversos.astype(np.int64), list(observados)
+
+    indice = {estado: i for i, estado in enumerate(estados)}
+    mapa = np.array([indice[estado] for estado in observados.tolist()], dtype=np.int64)
+    return mapa[inversos], list(estados)
+
+
+# ---------------------------------------------------------
+# CONTAGENS N_{c,a}
+# ---------------------------------------------------------
+def contextos_rolantes(x, k, m):
+    """
+    Códigos base m dos contextos (x_{t-k}, ..., x_{t-1}) para t = k..n-1.
+
+    Mesma ordem de itertools.product(estados, repeat=k): o estado mais antigo é o
+    dígito mais significativo. São k operações vetorizadas sobre a sequência toda.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    n = len(x) - k
+    codigos = np.zeros(max(n, 0), dtype=np.int64)
+    for j in range(k):
+        codigos = codigos * m + x[j:j + n]
+    return codigos
+
+
+def contar_transicoes(x, k, m):
+    """
+    Tabela densa N (m^k x m) com N[c, a] = número de vezes que a segue o contexto c.
+
+    `x` são os códigos da sequência; N_c é N.sum(axis=1).
+    """
+    x = np.asarray(x, dtype=np.int64)
+    if len(x) <= k:
+        return np.zeros((m ** k, m), dtype=np.int64)
+
+    indices = contextos_rolantes(x, k, m) * m + x[k:]
+    return np.bincount(indices, minlength=m ** (k + 1)).reshape(m ** k, m)
+
+
+def contar_transicoes_lote(X, k, m):
+    """
+    Tabelas N de várias sequências de mesmo tamanho (linhas de X), num array
+    (B, m^k, m), com um único bincount: o índice de cada réplica é deslocado de
+    b·m^(k+1).
+    """
+    X = np.asarray(X, dtype=np.int64)
+    B, n = X.shape
+    if n <= k:
+        return np.zeros((B, m ** k, m), dtype=np.int64)
+
+    contextos = np.zeros((B, n - k), dtype=np.int64)
+    for j in range(k):
+        contextos = contextos * m + X[:, j:j + n - k]
+
+    indices = (np.arange(B)[:, None] * m ** (k + 1) + contextos * m + X[:, k:]).ravel()
+    return np.bincount(indices, minlength=B * m ** (k + 1)).reshape(B, m ** k, m)
+
+
+def contar_ordens(x, k_max, m):
+    """
+    Tabelas [N_0, N_1, ..., N_{k_max}] a partir de uma única contagem de ordem k_max.
+
+    N_k sai de N_{k+1} somando sobre o estado mais antigo do contexto (o dígito
+    mais significativo). A contagem de ordem k+1 começa em t = k+1, então falta só
+    a transição em t = k, somada à parte.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    return marginalizar_ordens(contar_transicoes(x, k_max, m), x[:k_max], k_max, m)
+
+
+def marginalizar_ordens(N_max, inicio, k_max, m):
+    """
+    Tabelas [N_0, ..., N_{k_max}] a partir da de ordem k_max; `inicio` são os
+    primeiros k_max estados da sequência.
+    """
+    tabelas = [N_max]
+
+    for k in range(k_max - 1, -1, -1):
+        N = tabelas[0].reshape(m, m ** k, m).sum(axis=0)
+        if len(inicio) > k:
+            contexto = contextos_rolantes(inicio[:k + 1], k, m)[0]
+            N[contexto, inicio[k]] += 1
+        tabelas.insert(0, N)
+
+    return tabelas
+
+
+def marginalizar_ordens_lote(N_max, X, k_max, m):
+    """
+    Versão de `marginalizar_ordens` para um array (B, m^k_max, m) de contagens das
+    linhas de X: devolve [N_0, ..., N_{k_max}], cada um (B, m^k, m).
+    """
+    B = N_max.shape[0]
+    X = np.asarray(X, dtype=np.int64)
+    linhas = np.arange(B)
+    tabelas = [N_max]
+
+    for k in range(k_max - 1, -1, -1):
+        N = tabelas[0].reshape(B, m, m ** k, m).sum(axis=1)
+        if X.shape[1] > k:
+            contexto = np.zeros(B, dtype=np.int64)
+            for j in range(k):
+                contexto = contexto * m + X[:, j]
+            N[linhas, contexto, X[:, k]] += 1
+        tabelas.insert(0, N)
+
+    return tabelas
+
+
+# ---------------------------------------------------------
+# CONTAGEM EM BLOCOS (FORA DA MEMÓRIA)
+# ---------------------------------------------------------
+def contar_transicoes_blocos(blocos, k, m):
+    """
+    Mesma tabela de `contar_transicoes`, lendo a sequência bloco a bloco.
+
+    Os k últimos estados de cada bloco são carregados para o seguinte: são o
+    contexto das primeiras transições do próximo bloco. A memória depende só do
+    tamanho do bloco e da tabela. Serve, por exemplo, para a saída de `gerar_ordem_K`.
+    """
+    N, _ = _contar_blocos(blocos, k, m)
+    return N
+
+
+def contar_ordens_blocos(blocos, k_max, m):
+    """Tabelas [N_0, ..., N_{k_max}] lendo a sequência bloco a bloco."""
+    N, inicio = _contar_blocos(blocos, k_max, m)
+    return marginalizar_ordens(N, inicio, k_max, m)
+
+
+def _contar_blocos(blocos, k, m):
+    N = np.zeros((m ** k, m), dtype=np.int64)
+    resto = np.empty(0, dtype=np.int64)
+    inicio = np.empty(0, dtype=np.int64)
+
+    for bloco in blocos:
+        y = np.concatenate((resto, np.asarray(bloco, dtype=np.int64)))
+        N += contar_transicoes(y, k, m)
+        resto = y[max(len(y) - k, 0):] if k else resto
+
+        # Os primeiros k estados da sequência (para as ordens menores)
+        if len(inicio) < k:
+            inicio = y[:k]
+
+    return N, inicio
+
+
+def ler_blocos(caminho, dtype=np.uint8, tamanho_bloco=2 ** 24):
+    """Lê um arquivo binário de códigos (uint8/uint16) por memmap, em blocos."""
+    x = np.memmap(caminho, dtype=dtype, mode="r")
+    for i in range(0, len(x), tamanho_bloco):
+        yield x[i:i + tamanho_bloco]
+
+
+def salvar_blocos(caminho, blocos, dtype=np.uint8):
+    """Grava blocos de códigos num arquivo binário, no formato lido por `ler_blocos`."""
+    with open(caminho, "wb") as arquivo:
+        for bloco in blocos:
+            arquivo.write(np.asarray(bloco).astype(dtype).tobytes())
+
+
+def contar_transicoes_arquivo(caminho, k, m, dtype=np.uint8, tamanho_bloco=2 ** 24):
+    """Tabela N (m^k x m) de um arquivo de códigos, sem carregá-lo inteiro."""
+    return contar_transicoes_blocos(ler_blocos(caminho, dtype, tamanho_bloco), k, m)
+
+
+def log_verossimilhanca_arquivo(caminho, k, m, dtype=np.uint8, tamanho_bloco=2 ** 24):
+    """Log-verossimilhança de ordem k de um arquivo de códigos."""
+    return log_verossimilhanca_contagens(contar_transicoes_arquivo(caminho, k, m, dtype, tamanho_bloco))
+
+
+# ---------------------------------------------------------
+# LOG-VEROSSIMILHANÇA
+# ---------------------------------------------------------
+def _n_log_n(a):
+    # a log a, com 0 log 0 = 0
+    a = np.asarray(a, dtype=float)
+    return a * np.log(np.where(a > 0, a, 1.0))
+
+
+def log_verossimilhanca_contagens(N):
+    """
+    ℓ = Σ_c Σ_a N_{c,a} log(N_{c,a} / N_c), escrita como
+    Σ N_{c,a} log N_{c,a} − Σ N_c log N_c para ser uma única expressão vetorizada.
+    """
+    N = np.asarray(N)
+    return float(_n_log_n(N).sum() - _n_log_n(N.sum(axis=-1)).sum())
+
+
+def log_verossimilhanca_lote(N):
+    """ℓ de cada tabela de um array (B, m^k, m) de contagens."""
+    N = np.asarray(N)
+    return _n_log_n(N).sum(axis=(1, 2)) - _n_log_n(N.sum(axis=2)).sum(axis=1)
+
+
+def estimar_transicoes(N):
+    """EMV p̂(a | c) = N_{c,a} / N_c; contextos não observados ficam com linha de zeros."""
+    N = np.asarray(N, dtype=float)
+    N_c = N.sum(axis=1, keepdims=True)
+    return np.divide(N, N_c, out=np.zeros_like(N), where=N_c > 0)
+
+
+def log_verossimilhanca_markov(sequencia, k, estados=None):
+    """Log-verossimilhança maximizada da cadeia de ordem k (mesmo valor da versão com dicionários)."""
+    x, estados = codificar(sequencia, estados)
+    return log_verossimilhanca_contagens(contar_transicoes(x, k, len(estados)))
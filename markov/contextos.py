@@ -0,0 +1,84 @@
+import itertools
+
+import numpy as np
+
+
+# ---------------------------------------------------------
+# CONTEXTOS COMO INTEIROS
+# ---------------------------------------------------------
+# Um contexto (x_{t-K}, ..., x_{t-1}) de códigos 0..m-1 vira o inteiro na base m
+# com o estado mais antigo como dígito mais significativo. Essa é a mesma ordem
+# de itertools.product(estados, repeat=K), então a linha i da tabela densa
+# corresponde ao i-ésimo contexto listado nas páginas.
+
+def ordem_da_tabela(Q):
+    """Recupera K a partir de uma tabela densa de formato (m^K, m)."""
+    n_contextos, m = np.shape(Q)
+    K = 0
+    while m ** K < n_contextos:
+        K += 1
+    if m ** K != n_contextos:
+        raise ValueError(f"A tabela tem {n_contextos} linhas, que não é potência de m={m}.")
+    return K
+
+
+def codigo_contexto(X, m):
+    """Código base m dos contextos nas linhas de X (último eixo = tempo)."""
+    X = np.asarray(X, dtype=np.int64)
+    codigo = np.zeros(X.shape[:-1], dtype=np.int64)
+    for j in range(X.shape[-1]):
+        codigo = codigo * m + X[..., j]
+    return codigo
+
+
+def tabela_de_dicionario(dicionario, estados):
+    """Tabela densa (m^K, m) a partir do dicionário {contexto: probabilidades}."""
+    m = len(estados)
+    K = len(next(iter(dicionario)))
+    contextos = itertools.product(estados, repeat=K)
+    return np.array([dicionario[ctx] for ctx in contextos], dtype=float).reshape(m ** K, m)
+
+
+def tabela_para_dicionario(Q, estados):
+    """Dicionário {contexto: probabilidades} a partir da tabela densa."""
+    K = ordem_da_tabela(Q)
+    contextos = itertools.product(estados, repeat=K)
+    return {ctx: np.array(Q[i]) for i, ctx in enumerate(contextos)}
+
+
+# ---------------------------------------------------------
+# ÁRVORE (DICIONÁRIOS ANINHADOS)
+# ---------------------------------------------------------
+def tabela_de_arvore(arvore, estados):
+    """Tabela densa (m^K, m) a partir da árvore arvore[x_{t-K}]...[x_{t-1}]."""
+    m = len(estados)
+
+    # A profundidade da árvore é a ordem K
+    K = 0
+    no = arvore
+    while isinstance(no, dict):
+        no = next(iter(no.values()))
+        K += 1
+
+    linhas = []
+    for ctx in itertools.product(estados, repeat=K):
+        no = arvore
+        for estado in ctx:
+            no = no[estado]
+        linhas.append(no)
+
+    return np.array(linhas, dtype=float).reshape(m ** K, m)
+
+
+def tabela_para_arvore(Q, estados):
+    """Árvore de dicionários aninhados a partir da tabela densa."""
+    K = ordem_da_tabela(Q)
+    arvore = {}
+
+    for i, ctx in enumerate(itertools.product(estados, repeat=K)):
+        no = arvore
+        for estado in ctx[:-1]:
+            no = no.setdefault(estado, {})
+        no[ctx[-1]] = np.asarray(Q[i]).tolist()
+
+    return arvore
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+# ---------------------------------------------------------
+# EDITOR DE TABELAS DE TRANSIÇÃO
+# ---------------------------------------------------------
+# Uma única grade (st.data_editor) para a tabela densa (linhas x m), no lugar de um
+# number_input por probabilidade. st.session_state[chave] é a tabela de entrada da
+# grade e só muda nas operações em bloco (normalizar, Dirichlet, importar CSV), que
+# também trocam a versão do editor para que edições antigas não voltem por cima. A
+# identidade da grade depende dos dados de entrada: se a tabela editada voltasse a
+# ser a entrada, cada edição mudaria a grade e a edição seguinte seria perdida. A
+# tabela com as edições fica à parte, em st.session_state[f"{chave}_atual"].
+
+
+def _versao(chave):
+    return st.session_state.get(f"{chave}_versao", 0)
+
+
+def _substituir(chave, tabela):
+    st.session_state[chave] = tabela
+    st.session_state[f"{chave}_atual"] = tabela
+    st.session_state[f"{chave}_versao"] = _versao(chave) + 1
+
+
+def _normalizar(chave):
+    tabela = st.session_state[f"{chave}_atual"]
+    soma = tabela.sum(axis=1, keepdims=True)
+    _substituir(chave, np.divide(tabela, soma, out=np.full_like(tabela, 1.0 / tabela.shape[1]),
+                                 where=soma > 0))
+
+
+def _dirichlet(chave, alpha):
+    linhas, m = st.session_state[chave].shape
+    _substituir(chave, np.random.default_rng().dirichlet(np.full(m, alpha), size=linhas))
+
+
+def editor_transicoes(chave, linhas, estados, nome_linhas="Estado atual"):
+    """
+    Grade editável da tabela de transição, com uma linha por elemento de `linhas`
+    (estados ou contextos) e uma coluna por estado. Devolve a tabela com cada linha
+    normalizada; para a página se alguma linha somar zero.
+    """
+    m = len(estados)
+    rotulos = [", ".join(map(str, r)) if isinstance(r, tuple) else str(r) for r in linhas]
+
+    # Tabela uniforme quando ainda não existe ou quando m ou K mudaram
+    if chave not in st.session_state or st.session_state[chave].shape != (len(rotulos), m):
+        _substituir(chave, np.full((len(rotulos), m), 1.0 / m))
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.button("Normalizar linhas", key=f"{chave}_normalizar", use_container_width=True,
+                  on_click=_normalizar, args=(chave,))
+    with col2:
+        alpha = st.number_input("α da Dirichlet", 0.01, 100.0, 1.0, key=f"{chave}_alpha")
+    with col3:
+        st.button("Preencher com Dirichlet", key=f"{chave}_dirichlet", use_container_width=True,
+                  on_click=_dirichlet, args=(chave, alpha))
+
+    # Importação: cada arquivo é aplicado uma única vez, depois de validado; um
+    # arquivo inválido continua mostrando o erro até ser trocado
+    arquivo = st.file_uploader("Importar CSV", type="csv", key=f"{chave}_arquivo")
+    if arquivo is not None and st.session_state.get(f"{chave}_importado") != arquivo.file_id:
+        try:
+            arquivo.seek(0)
+            importada = pd.read_csv(arquivo, index_col=0).to_numpy(dtype=float)
+        except (ValueError, pd.errors.ParserError) as erro:  # inclui EmptyDataError
+            st.error(f"Não foi possível ler o CSV: {erro}")
+        else:
+            if importada.shape != (len(rotulos), m):
+                st.error(f"O CSV tem formato {importada.shape}; o esperado é {(len(rotulos), m)}.")
+            elif not np.isfinite(importada).all():
+                st.error("O CSV tem células vazias ou valores não numéricos.")
+            elif (importada < 0).any():
+                st.error("O CSV tem probabilidades negativas.")
+            else:
+                st.session_state[f"{chave}_importado"] = arquivo.file_id
+                _substituir(chave, importada)
+
+    tabela = pd.DataFrame(st.session_state[chave], columns=estados,
+                          index=pd.Index(rotulos, name=nome_linhas))
+    config = {estado: st.column_config.NumberColumn(min_value=0.0, format="%.4f")
+              for estado in estados}
+
+    editada = st.data_editor(tabela, column_config=config, use_container_width=True,
+                             key=f"{chave}_grade_{_versao(chave)}")
+    Q = editada.fillna(0.0).to_numpy(dtype=float)  # célula apagada conta como zero
+    st.session_state[f"{chave}_atual"] = Q
+
+    st.download_button("Exportar CSV", editada.to_csv().encode("utf-8"),
+                       file_name=f"{chave}.csv", mime="text/csv", key=f"{chave}_exportar")
+
+    soma = Q.sum(axis=1, keepdims=True)
+    if (soma == 0).any():
+        vazias = [rotulos[i] for i in np.flatnonzero(soma[:, 0] == 0)[:5]]
+        st.error(f"As linhas {vazias} não podem somar zero.")
+        st.stop()
+
+    return Q / soma
@@ -0,0 +1,136 @@
+import itertools
+import json
+import os
+
+import numpy as np
+import pandas as pd
+from scipy.stats import chi2
+
+from markov.contagem import contar_transicoes_lote, log_verossimilhanca_lote, marginalizar_ordens_lote
+from markov.paralelo import mapear_conforme
+from markov.simulacao import simular_ordem_K_lote
+from markov.trajetoria import dtype_codigos
+
+# ---------------------------------------------------------
+# ESTUDO DE MONTE CARLO: TAMANHO, PODER E ORDEM SELECIONADA
+# ---------------------------------------------------------
+# Cada célula da grade é (m, K, n, esquema). Para cada uma, sorteia-se uma tabela de
+# transição de ordem K pelo esquema, simulam-se várias sequências de tamanho n e,
+# em todas ao mesmo tempo, calculam-se ℓ_0, ..., ℓ_{K+1}. A partir delas saem:
+#   - tamanho: rejeição de H0 no teste K contra K+1 (H0 verdadeira);
+#   - poder: rejeição de H0 no teste K-1 contra K (H0 falsa);
+#   - a ordem escolhida pelo TRV sequencial (a partir de k=0) e pelo BIC.
+
+ESQUEMAS = ("pagina", "dirichlet", "esparsa")
+
+
+def _verificar_esquema(esquema):
+    if esquema not in ESQUEMAS:
+        raise ValueError(f"Esquema desconhecido: {esquema!r}. Use um de {ESQUEMAS}.")
+
+
+def gerar_transicoes(m, K, esquema, rng):
+    """Tabela (m^K x m) sorteada pelo esquema escolhido."""
+    _verificar_esquema(esquema)
+    if esquema == "pagina":  # como na página 02: uniformes normalizadas
+        Q = rng.random((m ** K, m))
+        return Q / Q.sum(axis=1, keepdims=True)
+    if esquema == "dirichlet":
+        return rng.dirichlet(np.ones(m), size=m ** K)
+    # "esparsa": muitas probabilidades perto de zero
+    return rng.dirichlet(np.full(m, 0.2), size=m ** K)
+
+
+def montar_grade(ms, Ks, ns, esquemas=("pagina",)):
+    """Lista de células (dicionários) com todas as combinações de m, K, n e esquema."""
+    return [{"m": m, "K": K, "n": n, "esquema": esquema}
+            for m, K, n, esquema in itertools.product(ms, Ks, ns, esquemas)]
+
+
+def _chave(celula, n_replicas, alpha, seed):
+    # Resultados de outro número de réplicas, nível ou semente não são reaproveitados
+    return (celula["m"], celula["K"], celula["n"], celula["esquema"], n_replicas, alpha, seed)
+
+
+def _rodar_celula(tarefa):
+    celula, n_replicas, alpha, seed = tarefa
+    m, K, n = celula["m"], celula["K"], celula["n"]
+
+    # A semente de cada célula vem dos seus próprios parâmetros, não da posição na
+    # grade: a mesma célula dá o mesmo resultado em qualquer grade, retomada ou não
+    _verificar_esquema(celula["esquema"])
+    chave = (m, K, n, ESQUEMAS.index(celula["esquema"]))
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=chave))
+    Q = gerar_transicoes(m, K, celula["esquema"], rng)
+    X = simular_ordem_K_lote(Q, np.ones(m), n, n_replicas, rng, dtype=dtype_codigos(m))
+
+    # Uma contagem de ordem K+1 para todas as réplicas; as menores por marginalização
+    k_max = K + 1
+    N = marginalizar_ordens_lote(contar_transicoes_lote(X, k_max, m), X, k_max, m)
+    ell = np.column_stack([log_verossimilhanca_lote(N_k) for N_k in N])
+
+    # p-valores de todos os testes k contra k+1, para todas as réplicas
+    ks = np.arange(k_max)
+    df = (m - 1) * m ** (ks + 1) - (m - 1) * m ** ks
+    p = chi2.sf(2 * (ell[:, 1:] - ell[:, :-1]), df)
+    rejeita = p < alpha
+
+    # TRV sequencial: primeira ordem k que não é rejeitada contra k+1
+    aceita = ~rejeita
+    ordem_trv = np.where(aceita.any(axis=1), aceita.argmax(axis=1), k_max)
+
+    parametros = (m - 1) * m ** np.arange(k_max + 1)
+    bic = -2 * ell + parametros * np.log(n - np.arange(k_max + 1))
+    ordem_bic = bic.argmin(axis=1)
+
+    resultado = dict(celula)
+    resultado.update({
+        "replicas": n_replicas,
+        "alpha": alpha,
+        "seed": seed,
+        "tamanho": float(rejeita[:, K].mean()),
+        "poder": float(rejeita[:, K - 1].mean()) if K > 0 else None,
+        "ordem_trv": np.bincount(ordem_trv, minlength=k_max + 1).tolist(),
+        "ordem_bic": np.bincount(ordem_bic, minlength=k_max + 1).tolist(),
+    })
+    return resultado
+
+
+def executar_estudo(grade, n_replicas=200, alpha=0.05, seed=0, arquivo=None, n_processos=None):
+    """
+    Roda todas as células da grade, em paralelo entre células.
+
+    Com `arquivo`, cada célula concluída é gravada como uma linha JSON assim que
+    termina, e as células já presentes no arquivo com os mesmos `n_replicas`,
+    `alpha` e `seed` são puladas: um estudo interrompido continua de onde parou.
+    Devolve um DataFrame com uma linha por célula; `ordem_trv` e `ordem_bic` são as
+    contagens de cada ordem escolhida (índice = ordem).
+    """
+    grade = list(grade)
+    feitos = {}
+
+    if arquivo is not None and os.path.exists(arquivo):
+        with open(arquivo) as f:
+            for linha in f:
+                if linha.strip():
+                    resultado = json.loads(linha)
+                    chave = _chave(resultado, resultado.get("replicas"),
+                                   resultado.get("alpha"), resultado.get("seed"))
+                    feitos[chave] = resultado
+
+    pendentes = [(celula, n_replicas, alpha, seed)
+                 for celula in grade
+                 if _chave(celula, n_replicas, alpha, seed) not in feitos]
+
+    saida = open(arquivo, "a") if arquivo is not None else None
+    try:
+        for _, resultado in mapear_conforme(_rodar_celula, pendentes, n_processos):
+            feitos[_chave(resultado, n_replicas, alpha, seed)] = resultado
+            if saida is not None:
+                saida.write(json.dumps(resultado) + "\n")
+                saida.flush()
+    finally:
+        if saida is not None:
+            saida.close()
+
+    return pd.DataFrame([feitos[_chave(celula, n_replicas, alpha, seed)] for celula in grade])
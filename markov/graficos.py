@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from markov.trajetoria import Trajetoria
+
+# Acima deste número de passos, a trajetória é desenhada pela versão para séries longas
+LIMITE_TEXTO = 300
+
+
+# ---------------------------------------------------------
+# FIGURAS DAS PÁGINAS
+# ---------------------------------------------------------
+def figura_trajetoria(X, titulo=" ", janela=None, max_pontos=4000):
+    """
+    Trajetória (`Trajetoria` ou nomes dos estados) com um ponto, e o nome do
+    estado, por passo. Com mais de LIMITE_TEXTO passos, ou com uma `janela`
+    (t_inicial, t_final), usa `figura_trajetoria_longa`.
+    """
+    if len(X) > LIMITE_TEXTO or janela is not None:
+        return figura_trajetoria_longa(X, titulo, janela, max_pontos)
+
+    if isinstance(X, Trajetoria):
+        X = X.rotulos()
+
+    indices = list(range(len(X)))
+    fig = px.scatter(
+        x=indices,
+        y=X,
+        text=X,
+        title=titulo,
+        labels={"x": "Tempo (t)", "y": "Estado"},
+    )
+    fig.update_traces(mode="lines+markers+text", textposition="top center")
+    return fig
+
+
+def figura_trajetoria_longa(X, titulo=" ", janela=None, max_pontos=4000):
+    """
+    Trajetória longa em WebGL, sem rótulos por ponto, restrita à `janela`
+    (t_inicial, t_final), inclusiva.
+
+    Se a janela tem até `max_pontos` trocas de estado, desenha só os segmentos
+    (início de cada trecho constante, em degraus), o que é exato. Senão, divide a
+    janela em `max_pontos` // 2 faixas e desenha o menor e o maior estado de cada
+    uma. Diminuir a janela refina o desenho até voltar aos segmentos exatos.
+    """
+    if isinstance(X, Trajetoria):
+        codigos, estados = X.codigos, X.estados
+    else:
+        codigos, estados = pd.factorize(np.asarray(X), sort=True)
+    T = len(codigos)
+    inicio, fim = (0, T - 1) if janela is None else janela
+    inicio, fim = max(int(inicio), 0), min(int(fim), T - 1)
+    y = codigos[inicio:fim + 1]
+
+    trocas = np.flatnonzero(y[1:] != y[:-1]) + 1
+
+    if len(trocas) + 2 <= max_pontos:
+        # Segmentos: um ponto no início de cada trecho e um no fim da janela
+        t = np.concatenate(([0], trocas, [len(y) - 1]))
+        traco = go.Scattergl(x=t + inicio, y=y[t], mode="lines", line_shape="hv",
+                             name="estado")
+    else:
+        # Dizimação: menor e maior estado de cada faixa, como um traço vertical
+        faixas = max(max_pontos // 2, 1)
+        limites = np.linspace(0, len(y), faixas + 1).astype(np.int64)
+        limites = np.unique(limites)[:-1]
+        minimos = np.minimum.reduceat(y, limites)
+        maximos = np.maximum.reduceat(y, limites)
+        t = np.repeat(limites + inicio, 2)
+        traco = go.Scattergl(x=t, y=np.column_stack((minimos, maximos)).ravel(),
+                             mode="lines", name="estado (mín./máx. por faixa)")
+
+    fig = go.Figure(traco)
+    fig.update_layout(title=titulo, xaxis_title="Tempo (t)", yaxis_title="Estado")
+    fig.update_yaxes(tickvals=list(range(len(estados))), ticktext=[str(e) for e in estados])
+    fig.update_xaxes(range=[inicio, fim])
+    return fig
+
+
+def figura_matriz(M, estados, texto=".2f", escala="Blues", rotulo_x="Próximo estado",
+                  titulo_x="Próximo estado", espessura=20):
+    """Heatmap de uma matriz de transição, com os estados atuais nas linhas."""
+    fig = px.imshow(
+        M,
+        text_auto=texto,
+        color_continuous_scale=escala,
+        labels=dict(x=rotulo_x, y="Estado atual", color="Probabilidade"),
+        x=estados,
+        y=estados,
+        aspect="auto",
+    )
+
+    fig.update_layout(
+        title=" ",
+        xaxis_title=titulo_x,
+        yaxis_title="Estado atual",
+        font=dict(size=14),
+        coloraxis_colorbar=dict(
+            thickness=espessura,
+            len=0.75,
+            title="Probabilidade",
+            title_side="right"
+        ),
+    )
+
+    # Coloca os nomes das colunas em cima
+    fig.update_xaxes(side="top")
+    return fig
+
+
+def figura_convergencia(distancias, eps=0.25):
+    """Distância de variação total até a distribuição estacionária em função de n."""
+    n = list(range(1, len(distancias) + 1))
+    fig = px.line(
+        x=n,
+        y=distancias,
+        markers=True,
+        title=" ",
+        labels={"x": "Número de passos (n)", "y": "Distância de variação total"},
+    )
+    fig.add_hline(y=eps, line_dash="dash", annotation_text=f"ε = {eps}")
+    return fig
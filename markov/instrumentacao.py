@@ -0,0 +1,194 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+import tracemalloc
+
+import pandas as pd
+
+# ---------------------------------------------------------
+# INSTRUMENTAÇÃO DAS ETAPAS PESADAS
+# ---------------------------------------------------------
+# Liga com a variável de ambiente IC_INSTRUMENTACAO=1 antes de iniciar o app.
+# Desligada, `etapa` não faz nada e `medida` devolve a própria função.
+#
+# Cada etapa (simulação, potências da matriz, construção e desenho de figuras)
+# registra o tempo de relógio. Com IC_INSTRUMENTACAO=memoria, registra também o
+# pico de memória alocada acima do início da etapa (tracemalloc). O tracemalloc
+# deixa todas as alocações do processo bem mais lentas (uma simulação de 10^6
+# passos fica ~12x mais lenta), por isso só liga quando pedido. Há dois registros:
+#   - o do rerun atual, por thread (o Streamlit roda cada sessão numa thread);
+#   - os totais do processo, somados entre todas as sessões, protegidos por trava.
+# O tracemalloc é global ao processo, então com várias sessões ao mesmo tempo a
+# memória de uma etapa pode incluir alocações de outra: é uma aproximação.
+
+_MODO = os.environ.get("IC_INSTRUMENTACAO", "").lower()
+ATIVA = _MODO not in ("", "0", "false", "nao")
+MEMORIA = _MODO == "memoria"
+
+_TOTAIS = {}
+_COM_CACHE = set()  # etapas decoradas com com_cache=True (têm taxa de acerto)
+_TRAVA = threading.Lock()
+_local = threading.local()
+
+
+def _total(nome):
+    # Chamar com a trava adquirida
+    if nome not in _TOTAIS:
+        _TOTAIS[nome] = {"chamadas": 0, "execucoes": 0, "tempo": 0.0, "memoria": 0}
+    return _TOTAIS[nome]
+
+
+def iniciar_rerun():
+    """Zera o registro do rerun atual; chamada no começo de cada página."""
+    _local.rerun = []
+    _local.inicio = time.perf_counter()
+    _local.pilha = []
+    if MEMORIA and not tracemalloc.is_tracing():
+        tracemalloc.start()
+
+
+def _registro_rerun():
+    if not hasattr(_local, "rerun"):
+        iniciar_rerun()
+    return _local.rerun
+
+
+@contextlib.contextmanager
+def etapa(nome):
+    """Mede o bloco `with` como uma chamada da etapa `nome`."""
+    if not ATIVA:
+        yield
+        return
+
+    rerun = _registro_rerun()
+    pilha = _local.pilha
+
+    if MEMORIA:
+        # Etapas aninhadas: o pico já visto pela etapa de fora é guardado antes de zerar
+        atual, pico = tracemalloc.get_traced_memory()
+        if pilha:
+            pilha[-1][1] = max(pilha[-1][1], pico)
+        pilha.append([atual, atual])
+        tracemalloc.reset_peak()
+    inicio = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        tempo = time.perf_counter() - inicio
+        memoria = None
+        if MEMORIA:
+            _, pico = tracemalloc.get_traced_memory()
+            base, pico_etapa = pilha.pop()
+            pico_etapa = max(pico_etapa, pico)
+            if pilha:
+                pilha[-1][1] = max(pilha[-1][1], pico_etapa)
+            memoria = pico_etapa - base
+
+        rerun.append({"etapa": nome, "tempo": tempo, "memoria": memoria})
+        with _TRAVA:
+            total = _total(nome)
+            total["chamadas"] += 1
+            total["tempo"] += tempo
+            if memoria is not None:
+                total["memoria"] = max(total["memoria"], memoria)
+
+
+def execucao(nome):
+    """
+    Conta uma execução de verdade da etapa `nome`. Posta dentro de uma função com
+    `st.cache_data`, só roda quando o cache falha: acertos = chamadas − execuções.
+    """
+    if ATIVA:
+        with _TRAVA:
+            _total(nome)["execucoes"] += 1
+
+
+def medida(nome, com_cache=False):
+    """
+    Decorador: cada chamada da função vira uma chamada da etapa `nome`. Com
+    `com_cache=True`, a função é cacheada e chama `execucao` por dentro.
+    """
+    def decorador(funcao):
+        if not ATIVA:
+            return funcao
+        if com_cache:
+            _COM_CACHE.add(nome)
+
+        @functools.wraps(funcao)
+        def medida_(*args, **kwargs):
+            with etapa(nome):
+                return funcao(*args, **kwargs)
+        return medida_
+    return decorador
+
+
+def grafico(fig, **opcoes):
+    """`st.plotly_chart(fig, **opcoes)` medido como a etapa "desenho das figuras"."""
+    import streamlit as st
+
+    with etapa("desenho das figuras"):
+        st.plotly_chart(fig, **opcoes)
+
+
+# ---------------------------------------------------------
+# RESUMOS
+# ---------------------------------------------------------
+def resumo_rerun():
+    """
+    Tabela das etapas do rerun atual, na ordem em que rodaram (tempo em ms, memória
+    em KiB; sem IC_INSTRUMENTACAO=memoria a memória fica vazia).
+    """
+    linhas = [{"etapa": r["etapa"], "tempo (ms)": r["tempo"] * 1e3,
+               "pico (KiB)": None if r["memoria"] is None else r["memoria"] / 1024}
+              for r in _registro_rerun()]
+    return pd.DataFrame(linhas, columns=["etapa", "tempo (ms)", "pico (KiB)"])
+
+
+def resumo_total():
+    """Totais do processo por etapa, somados entre sessões, com a taxa de acerto do cache."""
+    with _TRAVA:
+        totais = {nome: dict(t) for nome, t in _TOTAIS.items()}
+
+    linhas = []
+    for nome, t in sorted(totais.items()):
+        # Etapas sem cache (desenho das figuras) não têm taxa de acerto
+        acertos = (1 - t["execucoes"] / t["chamadas"]) if nome in _COM_CACHE and t["chamadas"] else None
+        linhas.append({
+            "etapa": nome,
+            "chamadas": t["chamadas"],
+            "acertos do cache": acertos,
+            "tempo médio (ms)": t["tempo"] / t["chamadas"] * 1e3 if t["chamadas"] else 0.0,
+            "tempo total (s)": t["tempo"],
+            "maior pico (KiB)": t["memoria"] / 1024 if MEMORIA else None,
+        })
+    return pd.DataFrame(linhas, columns=["etapa", "chamadas", "acertos do cache", "tempo médio (ms)",
+                                         "tempo total (s)", "maior pico (KiB)"])
+
+
+def zerar():
+    """Apaga os totais acumulados do processo."""
+    with _TRAVA:
+        _TOTAIS.clear()
+
+
+def painel():
+    """Painel na barra lateral com o rerun atual e os totais; chamado no fim da página."""
+    if not ATIVA:
+        return
+
+    import streamlit as st
+
+    total_rerun = time.perf_counter() - getattr(_local, "inicio", time.perf_counter())
+
+    with st.sidebar.expander("⏱️ Instrumentação", expanded=False):
+        st.caption(f"Rerun atual: {total_rerun * 1e3:.1f} ms no total")
+        st.dataframe(resumo_rerun().style.format(precision=2, na_rep="—"), hide_index=True)
+
+        st.caption("Todas as sessões (desde o início do processo)")
+        st.dataframe(resumo_total().style.format(precision=2, na_rep="—")
+                     .format({"acertos do cache": "{:.0%}"}, na_rep="—"), hide_index=True)
+
+        st.button("Zerar totais", on_click=zerar)
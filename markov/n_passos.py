@@ -0,0 +1,59 @@
+import numpy as np
+
+
+# ---------------------------------------------------------
+# MATRIZES DE n PASSOS
+# ---------------------------------------------------------
+def potencias_transicao(P, N):
+    """
+    Todas as potências P^1, ..., P^N de uma vez, num array (N, m, m) com P^n em [n - 1].
+
+    Cada rodada multiplica, em lote, todas as potências já calculadas pela maior
+    delas, dobrando a quantidade disponível: log2(N) multiplicações em lote.
+    """
+    P = np.asarray(P, dtype=float)
+    m = P.shape[0]
+
+    potencias = np.empty((N, m, m))
+    potencias[0] = P
+    feitas = 1
+
+    while feitas < N:
+        passo = min(feitas, N - feitas)
+        # P^k · P^feitas = P^(feitas + k), para k = 1..passo
+        potencias[feitas:feitas + passo] = potencias[:passo] @ potencias[feitas - 1]
+        feitas += passo
+
+    return potencias
+
+
+# ---------------------------------------------------------
+# DISTRIBUIÇÃO ESTACIONÁRIA E CONVERGÊNCIA
+# ---------------------------------------------------------
+def distribuicao_estacionaria(P):
+    """Resolve π P = π com Σ π = 1 (para cadeias irredutíveis a solução é única)."""
+    P = np.asarray(P, dtype=float)
+    m = P.shape[0]
+
+    # π (P - I) = 0 e uma linha a mais para a restrição da soma
+    A = np.vstack([P.T - np.eye(m), np.ones(m)])
+    b = np.zeros(m + 1)
+    b[-1] = 1.0
+
+    pi, *_ = np.linalg.lstsq(A, b, rcond=None)
+    pi = np.clip(pi, 0.0, None)
+    return pi / pi.sum()
+
+
+def distancia_estacionaria(potencias, pi):
+    """
+    Distância de variação total até π no pior estado inicial, para cada n:
+    d(n) = max_i ½ Σ_j |Pⁿ[i, j] − π_j|.
+    """
+    return 0.5 * np.abs(potencias - pi).sum(axis=2).max(axis=1)
+
+
+def tempo_mistura(distancias, eps=0.25):
+    """Menor n com d(n) <= eps, ou None se não for atingido até N."""
+    abaixo = np.flatnonzero(np.asarray(distancias) <= eps)
+    return int(abaixo[0]) + 1 if len(abaixo) else None
@@ -0,0 +1,78 @@
+import math
+
+import numpy as np
+from scipy.stats import chi2
+
+from markov.contagem import estimar_transicoes
+
+
+def _delta_n_log_n(n):
+    # (n + 1) log(n + 1) − n log n, com 0 log 0 = 0
+    return (n + 1) * math.log(n + 1) - (n * math.log(n) if n > 0 else 0.0)
+
+
+# ---------------------------------------------------------
+# EMV E LOG-VEROSSIMILHANÇA ONLINE
+# ---------------------------------------------------------
+class EstimadorOnline:
+    """
+    Mantém N_{c,a}, N_c e ℓ_k de uma ou mais ordens enquanto os estados chegam.
+
+    Cada novo estado a muda só a entrada (c, a) do contexto atual c, então
+    ℓ_k = Σ N_{c,a} log N_{c,a} − Σ N_c log N_c é atualizada em O(1) pela
+    diferença desses dois termos. As contagens coincidem com `contar_transicoes`
+    aplicada a tudo o que já chegou.
+    """
+
+    def __init__(self, m, ordens):
+        self.m = m
+        self.ordens = sorted(set(ordens))
+        self.n = 0
+
+        self.N = {k: np.zeros((m ** k, m), dtype=np.int64) for k in self.ordens}
+        self.N_c = {k: np.zeros(m ** k, dtype=np.int64) for k in self.ordens}
+        self.ell = {k: 0.0 for k in self.ordens}
+
+        # Contexto atual de cada ordem como inteiro na base m
+        self._codigo = {k: 0 for k in self.ordens}
+
+    def atualizar(self, a):
+        """Incorpora o próximo estado (código 0..m-1)."""
+        a = int(a)
+        m = self.m
+
+        for k in self.ordens:
+            c = self._codigo[k]
+
+            # Só há transição de ordem k depois dos k primeiros estados
+            if self.n >= k:
+                N, N_c = self.N[k], self.N_c[k]
+                self.ell[k] += _delta_n_log_n(int(N[c, a])) - _delta_n_log_n(int(N_c[c]))
+                N[c, a] += 1
+                N_c[c] += 1
+
+            self._codigo[k] = (c * m + a) % (m ** k)
+
+        self.n += 1
+
+    def atualizar_varios(self, x):
+        """Incorpora uma sequência de estados, na ordem."""
+        for a in np.asarray(x).tolist():
+            self.atualizar(a)
+
+    # -----------------------------------------------------
+    # LEITURAS
+    # -----------------------------------------------------
+    def log_verossimilhanca(self, k):
+        return self.ell[k]
+
+    def probabilidades(self, k):
+        """EMV atual p̂(a | c) = N_{c,a} / N_c, tabela (m^k x m)."""
+        return estimar_transicoes(self.N[k])
+
+    def teste_razao(self, k):
+        """LR, graus de liberdade e p-valor da comparação entre as ordens k e k+1."""
+        m = self.m
+        LR = 2 * (self.ell[k + 1] - self.ell[k])
+        df = (m - 1) * (m ** (k + 1)) - (m - 1) * (m ** k)
+        return {"k_testado": k + 1, "LR": LR, "df": df, "p_value": float(chi2.sf(LR, df=df))}
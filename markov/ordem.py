@@ -0,0 +1,133 @@
+import numpy as np
+from scipy.stats import chi2
+
+from markov.bootstrap import MEMORIA_LOTE, teste_bootstrap_contagens
+from markov.contagem import codificar, log_verossimilhanca_contagens
+from markov.paralelo import contar_ordens_paralelo
+
+
+# ---------------------------------------------------------
+# LOG-VEROSSIMILHANÇAS DE VÁRIAS ORDENS
+# ---------------------------------------------------------
+def log_verossimilhancas(x, k_max, m, n_processos=1):
+    """
+    [ℓ_0, ..., ℓ_{k_max}] com uma única contagem da sequência codificada,
+    repartida entre `n_processos` processos (None: todos os núcleos).
+    """
+    N = contar_ordens_paralelo(x, k_max, m, n_processos)
+    return [log_verossimilhanca_contagens(N_k) for N_k in N]
+
+
+# ---------------------------------------------------------
+# TESTE DE RAZÃO DE VEROSSIMILHANÇA SEQUENCIAL
+# ---------------------------------------------------------
+def teste_razao_verossimilhanca_ordem(sequencia, k_min, k_max, alpha, estados=None,
+                                      n_processos=1, B=0, seed=None, memoria_lote=MEMORIA_LOTE):
+    """
+    Compara as ordens k e k+1 para k = k_min..k_max-1, parando no primeiro teste
+    que não rejeita H0 (mesma saída da função da página 03).
+
+    Todas as ℓ_k são calculadas de uma vez, a partir da contagem de ordem k_max.
+    Com B > 0, cada teste também traz o p-valor de um bootstrap paramétrico com B
+    réplicas (`p_value_bootstrap`), que passa a ser o usado no critério de parada;
+    `memoria_lote` limita a memória de cada lote de réplicas (bytes por processo).
+    """
+    x, estados = codificar(sequencia, estados)
+    m = len(estados)
+    N = contar_ordens_paralelo(x, k_max, m, n_processos)
+    ell = [log_verossimilhanca_contagens(N_k) for N_k in N]
+
+    resultados = []
+
+    for k in range(k_min, k_max):
+
+        # estatística de razão de verossimilhança
+        LR = 2 * (ell[k + 1] - ell[k])
+
+        # graus de liberdade
+        df = ((m - 1) * (m ** (k + 1)) - ((m - 1) * (m ** k)))
+
+        # p-valor
+        p_value = chi2.sf(LR, df=df)
+
+        resultado = {
+            "k_testado": k + 1,
+            "LR": LR,
+            "df": df,
+            "p_value": p_value
+        }
+
+        if B > 0:
+            semente = None if seed is None else [seed, k]
+            bootstrap = teste_bootstrap_contagens(x, m, N, k, B, semente, n_processos, memoria_lote)
+            resultado["p_value_bootstrap"] = bootstrap["p_value_bootstrap"]
+            p_value = bootstrap["p_value_bootstrap"]
+
+        resultados.append(resultado)
+
+        # critério de parada
+        if p_value >= alpha:
+            return {
+                "ordem_escolhida": (
+                    f"Na comparação entre as ordens {k} e {k + 1}, "
+                    f"não rejeita a hipótese nula de que a cadeia tenha ordem {k}"
+                ),
+                "motivo": "p-valor maior que o limiar",
+                "resultados": resultados
+            }
+
+    return {
+        "ordem_escolhida": k_max,
+        "motivo": "k_max atingido - cadeia pode ser de ordem maior",
+        "resultados": resultados
+    }
+
+
+# ---------------------------------------------------------
+# CRITÉRIOS DE INFORMAÇÃO (AIC / BIC)
+# ---------------------------------------------------------
+PARAMETROS = ("completo", "observados")
+
+
+def criterios_informacao(sequencia, k_min, k_max, estados=None, parametros="completo",
+                         n_processos=1):
+    """
+    AIC e BIC de todas as ordens k_min..k_max, a partir da mesma contagem de ordem k_max.
+
+    `parametros` define o número de parâmetros livres de cada ordem:
+    "completo" usa (m−1)·m^k; "observados" usa (m−1) vezes o número de contextos
+    que aparecem na sequência. O BIC usa como tamanho amostral o número de
+    transições de cada ordem, N = n − k.
+    """
+    if parametros not in PARAMETROS:
+        raise ValueError(f"Contagem de parâmetros desconhecida: {parametros!r}. Use um de {PARAMETROS}.")
+
+    x, estados = codificar(sequencia, estados)
+    m = len(estados)
+    N = contar_ordens_paralelo(x, k_max, m, n_processos)
+
+    resultados = []
+
+    for k in range(k_min, k_max + 1):
+        ell = log_verossimilhanca_contagens(N[k])
+
+        if parametros == "completo":
+            p = (m - 1) * m ** k
+        else:
+            p = (m - 1) * int((N[k].sum(axis=1) > 0).sum())
+
+        n_transicoes = int(N[k].sum())
+
+        resultados.append({
+            "k": k,
+            "log_verossimilhanca": ell,
+            "parametros": p,
+            "AIC": -2 * ell + 2 * p,
+            "BIC": -2 * ell + p * np.log(max(n_transicoes, 1))
+        })
+
+    return {
+        "ordem_AIC": min(resultados, key=lambda r: r["AIC"])["k"],
+        "ordem_BIC": min(resultados, key=lambda r: r["BIC"])["k"],
+        "resultados": resultados
+    }
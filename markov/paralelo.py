@@ -0,0 +1,119 @@
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from markov.contagem import contar_transicoes, marginalizar_ordens
+from markov.simulacao import simular_ordem_K_lote
+
+
+# ---------------------------------------------------------
+# EXECUÇÃO EM VÁRIOS PROCESSOS
+# ---------------------------------------------------------
+def mapear(funcao, tarefas, n_processos=None):
+    """
+    Aplica `funcao` a cada tarefa, distribuindo entre processos, e devolve os
+    resultados na ordem das tarefas. Com n_processos=1 roda no próprio processo.
+    """
+    tarefas = list(tarefas)
+    if n_processos is None:
+        n_processos = os.cpu_count() or 1
+    n_processos = min(n_processos, len(tarefas))
+
+    if n_processos <= 1:
+        return [funcao(tarefa) for tarefa in tarefas]
+
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        return list(executor.map(funcao, tarefas))
+
+
+def mapear_conforme(funcao, tarefas, n_processos=None):
+    """
+    Como `mapear`, mas gera pares (índice da tarefa, resultado) à medida que cada
+    tarefa termina, para quem precisa guardar resultados parciais.
+    """
+    tarefas = list(tarefas)
+    if n_processos is None:
+        n_processos = os.cpu_count() or 1
+    n_processos = min(n_processos, len(tarefas))
+
+    if n_processos <= 1:
+        for i, tarefa in enumerate(tarefas):
+            yield i, funcao(tarefa)
+        return
+
+    with ProcessPoolExecutor(max_workers=n_processos) as executor:
+        futuros = {executor.submit(funcao, tarefa): i for i, tarefa in enumerate(tarefas)}
+        for futuro in as_completed(futuros):
+            yield futuros[futuro], futuro.result()
+
+
+def dividir(N, tamanho):
+    """Tamanhos de lotes de no máximo `tamanho` que somam N."""
+    return [min(tamanho, N - i) for i in range(0, N, tamanho)]
+
+
+# ---------------------------------------------------------
+# SIMULAÇÃO PARALELA REPRODUTÍVEL
+# ---------------------------------------------------------
+def _simular_lote(tarefa):
+    Q, pi, T, N, semente, metodo = tarefa
+    return simular_ordem_K_lote(Q, pi, T, N, np.random.default_rng(semente), metodo)
+
+
+def simular_paralelo(Q, pi, T, N, seed=None, n_processos=None, metodo="acumulada",
+                     tamanho_lote=256):
+    """
+    Simula N réplicas de ordem K (N x T) repartidas entre processos.
+
+    As réplicas são divididas em lotes de tamanho fixo e cada lote recebe um
+    `Generator` próprio, criado por `SeedSequence(seed).spawn`. Como a divisão não
+    depende do número de processos, o resultado é idêntico para qualquer
+    `n_processos`. Ordem 1 é o caso em que Q é a matriz P.
+    """
+    Q = np.atleast_2d(np.asarray(Q, dtype=float))
+    tamanhos = dividir(N, tamanho_lote)
+    sementes = np.random.SeedSequence(seed).spawn(len(tamanhos))
+
+    tarefas = [(Q, pi, T, n, semente, metodo) for n, semente in zip(tamanhos, sementes)]
+    lotes = mapear(_simular_lote, tarefas, n_processos)
+
+    return np.vstack(lotes) if lotes else np.empty((0, T), dtype=np.int64)
+
+
+# ---------------------------------------------------------
+# CONTAGEM PARALELA EM FATIAS
+# ---------------------------------------------------------
+def _contar_fatia(tarefa):
+    fatia, k, m = tarefa
+    return contar_transicoes(fatia, k, m)
+
+
+def contar_transicoes_paralelo(x, k, m, n_processos=None, n_fatias=None):
+    """
+    Tabela N (m^k x m) contando fatias da sequência em processos separados.
+
+    As posições t = k..n-1 das transições são repartidas entre as fatias; cada
+    fatia leva junto os k estados anteriores como contexto, então cada transição é
+    contada exatamente uma vez e a soma das tabelas é a contagem exata.
+    """
+    x = np.asarray(x, dtype=np.int64)
+    if n_processos is None:
+        n_processos = os.cpu_count() or 1
+    n_fatias = n_processos if n_fatias is None else n_fatias
+
+    n_transicoes = max(len(x) - k, 0)
+    limites = [k + (s * n_transicoes) // n_fatias for s in range(n_fatias + 1)]
+    tarefas = [(x[a - k:b], k, m) for a, b in zip(limites, limites[1:]) if b > a]
+
+    N = np.zeros((m ** k, m), dtype=np.int64)
+    for N_fatia in mapear(_contar_fatia, tarefas, n_processos):
+        N += N_fatia
+    return N
+
+
+def contar_ordens_paralelo(x, k_max, m, n_processos=None, n_fatias=None):
+    """Tabelas [N_0, ..., N_{k_max}] com a contagem de ordem k_max feita em paralelo."""
+    x = np.asarray(x, dtype=np.int64)
+    N = contar_transicoes_paralelo(x, k_max, m, n_processos, n_fatias)
+    return marginalizar_ordens(N, x[:k_max], k_max, m)
@@ -0,0 +1,308 @@
+import bisect
+
+import numpy as np
+
+from markov.contextos import codigo_contexto, ordem_da_tabela
+
+METODOS = ("acumulada", "alias")
+
+
+# ---------------------------------------------------------
+# TABELAS
+# ---------------------------------------------------------
+def tabela_acumulada(P):
+    """Probabilidades acumuladas por linha de P, com a última coluna fixada em 1."""
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    C = np.cumsum(P / P.sum(axis=1, keepdims=True), axis=1)
+    C[:, -1] = 1.0  # evita que erro de arredondamento deixe u sem estado
+    return C
+
+
+def tabela_alias(P):
+    """
+    Tabelas de alias de Walker para cada linha de P.
+
+    Devolve (prob, alias), ambas (linhas x m): sorteia-se uma coluna j uniforme e
+    fica-se com j se u < prob[j], ou com alias[j] caso contrário. Cada linha é
+    montada pelo método de Vose, em O(m).
+    """
+    P = np.atleast_2d(np.asarray(P, dtype=float))
+    m = P.shape[1]
+    q = (P / P.sum(axis=1, keepdims=True) * m).tolist()
+
+    prob, alias = [], []
+
+    for linha in q:
+        prob_linha = [1.0] * m
+        alias_linha = list(range(m))
+        pequenos = [j for j in range(m) if linha[j] < 1.0]
+        grandes = [j for j in range(m) if linha[j] >= 1.0]
+
+        # Pareia uma coluna com massa < 1 com uma de massa >= 1; a sobra da grande
+        # volta para a lista certa. O que restar no fim tem massa 1 (prob = 1).
+        while pequenos and grandes:
+            s = pequenos.pop()
+            g = grandes[-1]
+            prob_linha[s] = linha[s]
+            alias_linha[s] = g
+            linha[g] -= 1.0 - linha[s]
+            if linha[g] < 1.0:
+                pequenos.append(grandes.pop())
+
+        prob.append(prob_linha)
+        alias.append(alias_linha)
+
+    prob = np.array(prob, dtype=float).reshape(P.shape)
+    alias = np.array(alias, dtype=np.int64).reshape(P.shape)
+    return np.clip(prob, 0.0, 1.0), alias
+
+
+def _sortear_linhas(C, u):
+    # Inversa da acumulada linha a linha: mesmo resultado do bisect_right
+    return (C <= u[:, None]).sum(axis=1)
+
+
+def _sortear_alias(prob, alias, linhas, u):
+    # Uma uniforme por sorteio: parte inteira escolhe a coluna, parte fracionária decide
+    m = prob.shape[1]
+    v = u * m
+    j = v.astype(np.int64)
+    return np.where(v - j < prob[linhas, j], j, alias[linhas, j])
+
+
+def _verificar_metodo(metodo):
+    if metodo not in METODOS:
+        raise ValueError(f"Método de sorteio desconhecido: {metodo!r}. Use um de {METODOS}.")
+
+
+def rotulos(X, estados):
+    """Converte códigos inteiros de estados nos nomes correspondentes."""
+    return np.asarray(estados)[X]
+
+
+# ---------------------------------------------------------
+# PASSOS DA SIMULAÇÃO (NÚCLEOS EM PYTHON PURO)
+# ---------------------------------------------------------
+def _tabelas_lista(Q, metodo):
+    # Tabelas calculadas uma única vez, como listas para os loops abaixo
+    if metodo == "acumulada":
+        return tabela_acumulada(Q).tolist()
+    return tuple(tab.tolist() for tab in tabela_alias(Q))
+
+
+def _passos_contexto(tabelas, metodo, m, mK, codigo, u, X, inicio):
+    # Preenche X[inicio:] a partir do contexto `codigo`; devolve o contexto final
+    if metodo == "acumulada":
+        for t in range(inicio, len(X)):
+            x = bisect.bisect_right(tabelas[codigo], u[t])  # linha do contexto atual
+            X[t] = x
+            codigo = (codigo * m + x) % mK  # desliza o contexto um passo
+
+    else:
+        prob, alias = tabelas
+        for t in range(inicio, len(X)):
+            v = u[t] * m
+            j = int(v)
+            x = j if v - j < prob[codigo][j] else alias[codigo][j]
+            X[t] = x
+            codigo = (codigo * m + x) % mK
+
+    return codigo
+
+
+def _passos_arvore(tabelas, metodo, m, filhos, raiz, X, u, inicio, desloc):
+    # Preenche X[inicio:]; as posições de u estão deslocadas de `desloc` em relação a X
+    if metodo == "alias":
+        prob, alias = tabelas
+
+    for t in range(inicio, len(X)):
+        # Desce a árvore a partir de x_{t-1} até chegar numa folha
+        no = raiz
+        d = 1
+        while no >= 0:
+            no = filhos[no][X[t - d]]
+            d += 1
+        f = -no - 1
+
+        if metodo == "acumulada":
+            X[t] = bisect.bisect_right(tabelas[f], u[t - desloc])
+        else:
+            v = u[t - desloc] * m
+            j = int(v)
+            X[t] = j if v - j < prob[f][j] else alias[f][j]
+
+
+def _juntar(blocos):
+    blocos = list(blocos)
+    return np.concatenate(blocos) if blocos else np.empty(0, dtype=np.int64)
+
+
+def _tamanhos_blocos(T, tamanho_bloco):
+    # Tamanhos dos blocos de uma trajetória de T passos (T=None: sem fim)
+    t = 0
+    while T is None or t < T:
+        n = tamanho_bloco if T is None else min(tamanho_bloco, T - t)
+        yield t, n
+        t += n
+
+
+# ---------------------------------------------------------
+# SIMULAÇÃO DE UMA TRAJETÓRIA
+# ---------------------------------------------------------
+def simular_ordem_1(P, pi, T, rng=None, metodo="acumulada"):
+    """
+    Simula T passos de uma cadeia de ordem 1.
+
+    Os estados são códigos inteiros 0..m-1 (posições em `estados`); use `rotulos`
+    (ou `Trajetoria`) para obter os nomes só no final. `metodo` escolhe o sorteio do próximo estado:
+    "acumulada" (inversa da acumulada, busca binária) ou "alias" (Walker, O(1)).
+    """
+    # Ordem 1 é o caso K=1: P já é a tabela (m^1, m)
+    return simular_ordem_K(P, pi, T, rng, metodo)
+
+
+def simular_ordem_K(Q, pi, T, rng=None, metodo="acumulada"):
+    """
+    Simula T passos de uma cadeia de ordem K a partir da tabela densa Q (m^K x m).
+
+    O contexto é mantido como um inteiro na base m e atualizado em O(1) por passo,
+    sem montar tuplas. Os K primeiros estados são sorteados segundo pi.
+    """
+    # Um único bloco do tamanho da trajetória: todos os sorteios de uma vez
+    return _juntar(gerar_ordem_K(Q, pi, T, max(T, 1), rng, metodo))
+
+
+# ---------------------------------------------------------
+# TRAJETÓRIAS EM BLOCOS (MEMÓRIA LIMITADA)
+# ---------------------------------------------------------
+def gerar_ordem_1(P, pi, T=None, tamanho_bloco=65536, rng=None, metodo="acumulada"):
+    """Gera a trajetória de ordem 1 em blocos; veja `gerar_ordem_K`."""
+    return gerar_ordem_K(P, pi, T, tamanho_bloco, rng, metodo)
+
+
+def gerar_ordem_K(Q, pi, T=None, tamanho_bloco=65536, rng=None, metodo="acumulada"):
+    """
+    Gera a trajetória de ordem K em blocos de até `tamanho_bloco` códigos.
+
+    Entre um bloco e outro só o contexto (os últimos K estados, como inteiro) é
+    guardado, então a memória não depende de T. Com T=None o gerador não termina.
+    A concatenação dos blocos é idêntica à saída de `simular_ordem_K` com o mesmo rng.
+    """
+    _verificar_metodo(metodo)
+    rng = np.random.default_rng(rng)
+
+    Q = np.atleast_2d(np.asarray(Q, dtype=float))
+    m = Q.shape[1]
+    K = ordem_da_tabela(Q)
+    mK = m ** K
+    pi_acum = tabela_acumulada(pi)[0].tolist()
+    tabelas = _tabelas_lista(Q, metodo)
+
+    codigo = 0
+    for t, n in _tamanhos_blocos(T, tamanho_bloco):
+        u = rng.random(n).tolist()
+        X = [0] * n
+
+        # K primeiros estados da trajetória, independentes
+        i = 0
+        while t + i < K and i < n:
+            x = bisect.bisect_right(pi_acum, u[i])
+            X[i] = x
+            codigo = codigo * m + x
+            i += 1
+
+        codigo = _passos_contexto(tabelas, metodo, m, mK, codigo, u, X, i)
+        yield np.array(X, dtype=np.int64)
+
+
+def gerar_arvore(arvore, pi, T=None, tamanho_bloco=65536, rng=None, metodo="acumulada"):
+    """
+    Gera a trajetória de uma `ArvoreContextos` em blocos, guardando entre blocos
+    apenas os últimos `arvore.profundidade` estados.
+    """
+    _verificar_metodo(metodo)
+    rng = np.random.default_rng(rng)
+
+    m = arvore.m
+    D = arvore.profundidade
+    filhos = arvore.filhos.tolist()
+    raiz = 0 if filhos else -1
+    pi_acum = tabela_acumulada(pi)[0].tolist()
+    tabelas = _tabelas_lista(arvore.probs, metodo)
+
+    historico = []
+    for t, n in _tamanhos_blocos(T, tamanho_bloco):
+        u = rng.random(n).tolist()
+
+        # Os estados do bloco vêm depois do histórico carregado do bloco anterior
+        X = historico + [0] * n
+        h = len(historico)
+
+        i = 0
+        while t + i < D and i < n:
+            X[h + i] = bisect.bisect_right(pi_acum, u[i])
+            i += 1
+
+        _passos_arvore(tabelas, metodo, m, filhos, raiz, X, u, h + i, h)
+        historico = X[len(X) - D:] if D else []
+        yield np.array(X[h:], dtype=np.int64)
+
+
+# ---------------------------------------------------------
+# SIMULAÇÃO EM LOTE (N TRAJETÓRIAS x T PASSOS)
+# ---------------------------------------------------------
+def simular_ordem_1_lote(P, pi, T, N, rng=None, metodo="acumulada"):
+    """Simula N trajetórias independentes de ordem 1; devolve um array N x T de códigos."""
+    return simular_ordem_K_lote(P, pi, T, N, rng, metodo)
+
+
+def simular_ordem_K_lote(Q, pi, T, N, rng=None, metodo="acumulada", dtype=np.int64):
+    """
+    Simula N trajetórias independentes de ordem K a partir da tabela densa Q (m^K x m).
+
+    Todas as N cadeias andam juntas: a cada passo, uma busca vetorizada das linhas
+    dos N contextos atuais. Os K primeiros estados são sorteados segundo pi. `dtype`
+    é o tipo do array devolvido (ex.: `dtype_codigos(m)`, 1 byte por passo).
+    """
+    _verificar_metodo(metodo)
+    rng = np.random.default_rng(rng)
+
+    Q = np.atleast_2d(np.asarray(Q, dtype=float))
+    m = Q.shape[1]
+    K = ordem_da_tabela(Q)
+    mK = m ** K
+    pi_acum = tabela_acumulada(pi)[0]
+
+    X = np.empty((N, T), dtype=dtype)
+    X[:, :K] = np.searchsorted(pi_acum, rng.random((N, min(K, T))), side="right")
+    codigo = codigo_contexto(X[:, :K], m)
+
+    if metodo == "acumulada":
+        C = tabela_acumulada(Q)
+    else:
+        prob, alias = tabela_alias(Q)
+
+    for t in range(K, T):
+        u = rng.random(N)
+        if metodo == "acumulada":
+            x = _sortear_linhas(C[codigo], u)
+        else:
+            x = _sortear_alias(prob, alias, codigo, u)
+        X[:, t] = x
+        codigo = (codigo * m + x) % mK  # desliza o contexto um passo
+
+    return X
+
+
+# ---------------------------------------------------------
+# SIMULAÇÃO A PARTIR DE UMA ÁRVORE DE CONTEXTOS ESPARSA
+# ---------------------------------------------------------
+def simular_arvore(arvore, pi, T, rng=None, metodo="acumulada"):
+    """
+    Simula T passos a partir de uma `ArvoreContextos` (contextos de tamanho variável).
+
+    A cada passo a folha é encontrada descendo a árvore pelos estados mais recentes,
+    em O(profundidade). Os primeiros `arvore.profundidade` estados são sorteados
+    segundo pi.
+    """
+    return _juntar(gerar_arvore(arvore, pi, T, max(T, 1), rng, metodo))
@@ -0,0 +1,191 @@
+from array import array
+
+import numpy as np
+
+
+# ---------------------------------------------------------
+# ÍNDICE DE SUFIXOS
+# ---------------------------------------------------------
+# O array de sufixos ordena as posições i da sequência pelo sufixo x[i:]. Todas as
+# ocorrências de um contexto c ficam num bloco contíguo desse array, encontrado por
+# busca binária, então N_c e N_{c,a} saem em O(|c| log n) para qualquer tamanho de
+# contexto, sem recontar a sequência. O LCP (maior prefixo comum entre sufixos
+# vizinhos) permite listar de uma vez os contextos frequentes de um tamanho.
+
+def _ordenar_sufixos(x):
+    # Duplicação de prefixos: ranks de prefixos de tamanho 2^j, um nível por vez.
+    # Um sufixo que acaba antes do tamanho do prefixo recebe -1 (fica antes).
+    n = len(x)
+    rank = x.astype(np.int64)
+    passo = 1
+
+    while passo < n:
+        seguinte = np.full(n, -1, dtype=np.int64)
+        seguinte[:n - passo] = rank[passo:]
+
+        # Base maior que qualquer rank: no primeiro nível os ranks são os próprios
+        # códigos, que podem passar de n
+        chave = rank * (int(rank.max()) + 2) + (seguinte + 1)
+        del seguinte
+        ordem = np.argsort(chave, kind="stable")
+        chave_ordenada = chave[ordem]
+        del chave
+
+        rank = np.empty(n, dtype=np.int64)
+        rank[ordem] = np.concatenate(([0], np.cumsum(chave_ordenada[1:] != chave_ordenada[:-1])))
+        del chave_ordenada
+        passo *= 2
+
+        if rank[ordem[-1]] == n - 1:  # todos os prefixos já são distintos
+            break
+
+    return np.argsort(rank, kind="stable")
+
+
+def _lcp_vizinhos(x, sa):
+    # Kasai: percorre os sufixos na ordem do texto. Se o sufixo i tem LCP h com o
+    # vizinho anterior no array, o sufixo i+1 tem LCP de pelo menos h-1, então o
+    # total de comparações é O(n). Os arrays do laço são `array`/`bytes` (8 ou 1
+    # byte por posição), não listas de inteiros do Python.
+    n = len(sa)
+    posicao = np.empty(n, dtype=np.int64)
+    posicao[sa] = np.arange(n)
+
+    texto = x.astype(np.uint8).tobytes() if x.max(initial=0) < 256 else array("q", x.tobytes())
+    anterior = array("q", np.concatenate(([0], sa[:-1])).tobytes())  # sa[r - 1]
+    lcp = array("q", bytes(8 * max(n - 1, 0)))
+    h = 0
+
+    for i, r in enumerate(array("q", posicao.tobytes())):
+        if r == 0:
+            h = 0
+            continue
+        j = anterior[r]
+        while i + h < n and j + h < n and texto[i + h] == texto[j + h]:
+            h += 1
+        lcp[r - 1] = h
+        if h:
+            h -= 1
+
+    return np.frombuffer(lcp, dtype=np.int64).copy()
+
+
+class IndiceSufixos:
+    """Array de sufixos (com LCP) de uma sequência codificada, para contagens sob demanda."""
+
+    def __init__(self, x, m):
+        x = np.asarray(x, dtype=np.int64)
+        self.m = m
+        self.n = len(x)
+        self.x = x
+
+        if self.n:
+            self.sa = _ordenar_sufixos(x)
+            self.lcp = _lcp_vizinhos(x, self.sa)
+        else:
+            self.sa = np.empty(0, dtype=np.int64)
+            self.lcp = np.empty(0, dtype=np.int64)
+
+        # Comparações de fatias de bytes são feitas em C
+        if m <= 256:
+            self._texto = x.astype(np.uint8).tobytes()
+            self._padrao = lambda c: bytes(bytearray(int(s) for s in c))
+        else:
+            self._texto = x.tolist()
+            self._padrao = lambda c: [int(s) for s in c]
+
+    # -----------------------------------------------------
+    # BUSCA
+    # -----------------------------------------------------
+    def intervalo(self, contexto, inicio=0, fim=None):
+        """Bloco [lo, hi) do array de sufixos que começa com `contexto`."""
+        padrao = self._padrao(contexto)
+        L = len(padrao)
+        texto, sa = self._texto, self.sa
+        fim = self.n if fim is None else fim
+
+        lo, hi = inicio, fim
+        while lo < hi:
+            meio = (lo + hi) // 2
+            i = sa[meio]
+            if texto[i:i + L] < padrao:
+                lo = meio + 1
+            else:
+                hi = meio
+
+        inicio_bloco = lo
+        hi = fim
+        while lo < hi:
+            meio = (lo + hi) // 2
+            i = sa[meio]
+            if texto[i:i + L] <= padrao:
+                lo = meio + 1
+            else:
+                hi = meio
+
+        return inicio_bloco, lo
+
+    def ocorrencias(self, contexto):
+        """Número de ocorrências de `contexto` (tupla de códigos) na sequência."""
+        lo, hi = self.intervalo(contexto)
+        return hi - lo
+
+    # -----------------------------------------------------
+    # CONTAGENS DO EMV
+    # -----------------------------------------------------
+    def N_c(self, contexto):
+        """N_c: ocorrências de `contexto` seguidas de algum estado."""
+        L = len(contexto)
+        # A ocorrência que termina a sequência não é seguida de nenhum estado
+        no_fim = 0 < L <= self.n and self._texto[self.n - L:] == self._padrao(contexto)
+        return self.ocorrencias(contexto) - int(no_fim)
+
+    def N_ca(self, contexto, a):
+        """N_{c,a}: vezes que o estado `a` vem logo depois de `contexto`."""
+        return self.ocorrencias(tuple(contexto) + (a,))
+
+    def contagens(self, contexto):
+        """Vetor (N_{c,a})_a, buscando só dentro do bloco de `contexto`."""
+        lo, hi = self.intervalo(contexto)
+        contexto = tuple(contexto)
+        N = np.zeros(self.m, dtype=np.int64)
+        for a in range(self.m):
+            ini, fim = self.intervalo(contexto + (a,), lo, hi)
+            N[a] = fim - ini
+        return N
+
+    # -----------------------------------------------------
+    # CONTEXTOS FREQUENTES
+    # -----------------------------------------------------
+    def contextos_frequentes(self, t, tamanho):
+        """
+        Contextos de tamanho `tamanho` que ocorrem pelo menos t vezes, como lista de
+        (contexto, ocorrências). Sufixos vizinhos com LCP >= tamanho formam um grupo.
+        """
+        if tamanho > self.n or self.n == 0:
+            return []
+
+        # Um grupo novo começa onde o LCP com o vizinho anterior é menor que o tamanho
+        inicio = np.flatnonzero(np.concatenate(([True], self.lcp < tamanho)))
+        tamanho_grupo = np.diff(np.append(inicio, self.n))
+
+        # Sufixos curtos demais nunca ficam no meio de um grupo, só sozinhos
+        valido = self.sa[inicio] <= self.n - tamanho
+        escolhidos = valido & (tamanho_grupo >= t)
+
+        resultado = []
+        for r, contagem in zip(inicio[escolhidos], tamanho_grupo[escolhidos]):
+            i = self.sa[r]
+            resultado.append((tuple(self.x[i:i + tamanho].tolist()), int(contagem)))
+        return resultado
+
+    def contextos_frequentes_todos(self, t, tamanho_max=None):
+        """Contextos frequentes de todos os tamanhos, do 1 até o primeiro tamanho sem nenhum."""
+        tamanho_max = self.n if tamanho_max is None else tamanho_max
+        resultado = []
+        for tamanho in range(1, tamanho_max + 1):
+            frequentes = self.contextos_frequentes(t, tamanho)
+            if not frequentes:
+                break
+            resultado.extend(frequentes)
+        return resultado
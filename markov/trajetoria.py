@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+from markov.contagem import codificar
+
+
+# ---------------------------------------------------------
+# TRAJETÓRIA COMPACTA
+# ---------------------------------------------------------
+# Uma lista de np.str_ gasta dezenas de bytes por passo. Aqui a trajetória é um
+# array de códigos inteiros pequenos (1 byte até 127 estados, 2 bytes até 32767)
+# mais a lista de estados. Os tipos são os mesmos que o pandas usa nos códigos de
+# um Categorical, então `categorico()` não copia o array.
+
+def dtype_codigos(m):
+    """Menor tipo inteiro que guarda os códigos de m estados (o mesmo do pandas)."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if m < np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+class Trajetoria:
+    """Códigos 0..m-1 de cada passo e os nomes dos estados correspondentes."""
+
+    def __init__(self, codigos, estados):
+        self.estados = list(estados)
+        self.codigos = np.asarray(codigos).astype(dtype_codigos(len(self.estados)), copy=False)
+
+    @classmethod
+    def de_rotulos(cls, sequencia, estados=None):
+        """Trajetória a partir dos nomes dos estados; veja `codificar`."""
+        codigos, estados = codificar(sequencia, estados)
+        return cls(codigos, estados)
+
+    def __len__(self):
+        return len(self.codigos)
+
+    def __getitem__(self, indice):
+        # Um passo devolve o nome do estado; uma fatia, outra Trajetoria (sem cópia)
+        if isinstance(indice, slice):
+            return Trajetoria(self.codigos[indice], self.estados)
+        return self.estados[self.codigos[indice]]
+
+    def __iter__(self):
+        return iter(self.rotulos())
+
+    def __repr__(self):
+        return f"Trajetoria(T={len(self)}, estados={self.estados})"
+
+    @property
+    def m(self):
+        return len(self.estados)
+
+    @property
+    def nbytes(self):
+        return self.codigos.nbytes
+
+    def rotulos(self):
+        """Array com o nome do estado de cada passo."""
+        return np.asarray(self.estados)[self.codigos]
+
+    def categorico(self):
+        """pd.Categorical com as categorias na ordem de `estados`, sobre os mesmos códigos."""
+        return pd.Categorical.from_codes(self.codigos, categories=self.estados)
+
+    def serie(self, nome="Estado"):
+        """pd.Series categórica indexada pelo tempo, para tabelas."""
+        return pd.Series(self.categorico(), name=nome).rename_axis("t")
@@ -1,10 +1,16 @@
 import streamlit as st
 import numpy as np
-import plotly.express as px
+
+from markov import cache, instrumentacao
+from markov.editor import editor_transicoes
+from markov.graficos import LIMITE_TEXTO
+from markov.n_passos import tempo_mistura
 
 # -----------------------------
 # TÍTULO E INTRODUÇÃO
 # -----------------------------
+instrumentacao.iniciar_rerun()
+
 st.title("Simulação de Cadeia de Markov de Primeira Ordem")
 st.markdown("""
 Passo a passo como uma **Cadeia de Markov de primeira ordem** funciona.
@@ -129,23 +135,15 @@ if sec == 'Simulação':
     st.header("Simulação da Cadeia")
 
     T = st.slider("Número de passos (T)", 5, 200, 20)
+    semente = st.number_input("Semente", 0, 2 ** 32 - 1, 0)
 
-    X = []
-    X.append(np.random.choice(estados, p=pi))  # primeiro estado
-
-    for t in range(1, T):
-        estado_atual = X[-1]  # Olhe onde a cadeia está (estado atual); último elemento de X
-        i = estados.index(estado_atual)  # index do estado atual
-        proximo = np.random.choice(estados, p=P[
-            i])  # Escolhe o próximo estado com as probabilidades da LINHA da matriz de transição correspondente ao estado atual
-        X.append(proximo)  # Adiciona o estado atual a lista
+    # Mesma dinâmica do loop acima, mas com estados como inteiros e sorteios em lote
+    # (ordem 1 é o caso K=1; resultados e figuras ficam em cache por P, π, T e semente)
+    X = cache.simular(P, pi, T, estados, semente)
 
-    indices = list(range(T))
-    fig = px.scatter(x=indices, y=X, text=X, title=" ",
-                     labels={"x": "Tempo (t)", "y": "Estado"})
-    fig.update_traces(mode="lines+markers+text", textposition="top center")
+    fig = cache.figura_trajetoria(X)
 
-    st.plotly_chart(fig)
+    instrumentacao.grafico(fig)
 
 
 elif sec == 'Simulação interativa':
@@ -201,135 +199,92 @@ elif sec == 'Simulação interativa':
     st.divider()
     st.subheader("Matriz de Transição (P)")
 
-    P = np.zeros((m, m))
-
-    for i in range(m):
-        # st.markdown(f"**Linha: estado atual = {estados[i]}**")
-
-        # criar colunas (até 4 por linha)
-        cols_row = st.columns(min(m, 4))
-
-        row_vals = []
-        for j in range(m):
-            with cols_row[j % 4]:
-                row_vals.append(
-                    st.number_input(
-                        f"P({estados[i]} → {estados[j]})",
-                        0.0, 1.0,
-                        1.0 / m,
-                        key=f"p_{i}_{j}"
-                    )
-                )
-
-        row = np.array(row_vals)
-
-        if row.sum() == 0:
-            st.error(f"A linha do estado {estados[i]} não pode somar zero.")
-            st.stop()
-
-        P[i] = row / row.sum()
+    # Uma única grade para P (linhas normalizadas ao simular); CSV e Dirichlet em bloco
+    P = editor_transicoes("P", estados, estados)
     # -----------------------------
     # VISUALIZAÇÃO DA MATRIZ DE TRANSIÇÃO
     # -----------------------------
 
-    figP = px.imshow(
-        P,
-        text_auto=".2f",
-        color_continuous_scale="Blues",
-        labels=dict(x="Próximo estado", y="Estado atual", color="Probabilidade"),
-        x=estados,
-        y=estados,
-        aspect="auto",
-    )
-
-    figP.update_layout(
-        title=" ",
-        xaxis_title="Próximo estado",
-        yaxis_title="Estado atual",
-        font=dict(size=14),
-        coloraxis_colorbar=dict(
-            thickness=20,
-            len=0.75,
-            title="Probabilidade",
-            title_side="right"
-        ),
-    )
+    figP = cache.figura_matriz(P, estados)
 
-    figP.update_xaxes(side="top")
     st.divider()
-    st.plotly_chart(figP, use_container_width=True)
+    instrumentacao.grafico(figP, use_container_width=True)
 
     # Número de passos
     st.header("Simulação da Cadeia")
-    T = st.slider("Número de passos (T)", 5, 300, 20)
+    T = st.number_input("Número de passos (T)", 5, 1_000_000, 20)
+    semente = st.number_input("Semente", 0, 2 ** 32 - 1, 0)
 
     # ------------------------
     # SIMULAÇÃO
     # ------------------------
-    X = []
-    X.append(np.random.choice(estados, p=pi))
+    X = cache.simular(P, pi, T, estados, semente)
 
-    for t in range(1, T):
-        estado_atual = X[-1]
-        idx = estados.index(estado_atual)
-        proximo = np.random.choice(estados, p=P[idx])
-        X.append(proximo)
+    # Trajetórias longas: WebGL, e a janela escolhe o trecho desenhado em detalhe
+    janela = None
+    if T > LIMITE_TEXTO:
+        janela = st.slider("Janela de tempo", 0, T - 1, (0, T - 1),
+                           help="Diminua a janela para ver a trajetória com mais detalhe.")
 
     # Plot
-    indices = list(range(T))
-    fig = px.scatter(
-        x=indices,
-        y=X,
-        text=X,
-        title=" ",
-        labels={"x": "Tempo (t)", "y": "Estado"},
-    )
-    fig.update_traces(mode="lines+markers+text", textposition="top center")
-    st.plotly_chart(fig)
+    fig = cache.figura_trajetoria(X, janela=janela)
+    instrumentacao.grafico(fig)
 
     # MATRIZ DE N PASSOS + VISUALIZAÇÃO
     # -----------------------------
     st.divider()
     st.header("Matriz de Transição de n Passos")
 
-    n = st.slider("Escolha n para calcular Pⁿ", 1, 50, 5)
-    P_n = np.linalg.matrix_power(P, n)
+    N_MAX = 50
+    n = st.slider("Escolha n para calcular Pⁿ", 1, N_MAX, 5)
+
+    # Todas as potências são calculadas uma vez; mudar n é só uma consulta
+    P_n = cache.potencias(P, N_MAX)[n - 1]
 
     # -----------------------------
     # HEATMAP DE Pⁿ
     # -----------------------------
 
-    figPn = px.imshow(
+    figPn = cache.figura_matriz(
         P_n,
-        text_auto=".3f",
-        color_continuous_scale="Viridis",
-        labels=dict(
-            x="Estado no futuro",
-            y="Estado atual",
-            color="Probabilidade"
-        ),
-        x=estados,
-        y=estados,
-        aspect="auto",
+        estados,
+        texto=".3f",
+        escala="Viridis",
+        rotulo_x="Estado no futuro",
+        titulo_x="Próximo estado em n passos",
+        espessura=18,
     )
 
-    figPn.update_layout(
-        title=f" ",
-        xaxis_title="Próximo estado em n passos",
-        yaxis_title="Estado atual",
-        font=dict(size=14),
-        coloraxis_colorbar=dict(
-            thickness=18,
-            len=0.75,
-            title="Probabilidade",
-            title_side="right",
-        ),
+    instrumentacao.grafico(figPn, use_container_width=True)
+
+    st.info(
+        "Interpretação: Pⁿ[i, j] é a probabilidade de estar no estado j depois de n passos, partindo do estado i. Com n alto, probabilidades convergem para distribuição estacionária.")
+
+    # -----------------------------
+    # DISTRIBUIÇÃO ESTACIONÁRIA
+    # -----------------------------
+    st.divider()
+    st.header("Distribuição Estacionária")
+
+    pi_est, distancias = cache.convergencia(P, N_MAX)
+
+    st.dataframe(
+        {"Estado": estados, "π estacionária": np.round(pi_est, 4)},
+        hide_index=True,
     )
 
-    # Coloca os nomes das colunas em cima
-    figPn.update_xaxes(side="top")
+    st.markdown(r"""
+    A distância de variação total $d(n) = \max_i \frac{1}{2} \sum_j |P^n_{ij} - \pi_j|$
+    mede o quão longe a cadeia ainda está da distribuição estacionária após $n$ passos,
+    no pior estado inicial.
+    """)
 
-    st.plotly_chart(figPn, use_container_width=True)
+    instrumentacao.grafico(cache.figura_convergencia(distancias), use_container_width=True)
 
-    st.info(
-        "Interpretação: Pⁿ[i, j] é a probabilidade de estar no estado j depois de n passos, partindo do estado i. Com n alto, probabilidades convergem para distribuição estacionária.")
+    t_mix = tempo_mistura(distancias)
+    if t_mix is None:
+        st.warning(f"A distância não ficou abaixo de 0.25 em {N_MAX} passos.")
+    else:
+        st.metric("Tempo de mistura (d(n) ≤ 0.25)", f"{t_mix} passos")
+
+instrumentacao.painel()
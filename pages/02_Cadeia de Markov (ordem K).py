@@ -1,9 +1,15 @@
 import streamlit as st
 import numpy as np
 import itertools
-import plotly.express as px
 import pandas as pd
 
+from markov import cache, instrumentacao
+from markov.contextos import tabela_de_arvore, tabela_de_dicionario
+from markov.editor import editor_transicoes
+from markov.graficos import LIMITE_TEXTO
+
+instrumentacao.iniciar_rerun()
+
 st.title("Cadeia de Markov de Ordem K")
 
 st.markdown("""
@@ -134,34 +140,24 @@ if sec == 'Dicionário':
     K = 3
     T = 20
 
+    semente = st.number_input("Semente", 0, 2 ** 32 - 1, 0)
+    # Fluxos independentes para a tabela ([semente, 0]) e para a trajetória ([semente, 1])
+    rng = np.random.default_rng([semente, 0])
+
     contextos = list(itertools.product(estados, repeat=K))
 
     arvore = {}
     for ctx in contextos:
-        p = np.random.rand(len(estados))
+        p = rng.random(len(estados))
         p = p / p.sum()
         arvore[ctx] = p
 
     pi = np.array([0.5, 0.3, 0.2])
 
-    # Gerar estados iniciais
-    X = [np.random.choice(estados, p=pi) for _ in range(K)]
-
-    caminho = []  # para registrar passo a passo
-
-    # Loop da simulação
-    for t in range(K, T):
-        contexto = tuple(X[-K:])
-        probs = arvore[contexto]
-        proximo = np.random.choice(estados, p=probs)
-        X.append(proximo)
-
-        caminho.append({
-            "Passo": t,
-            "Contexto usado": contexto,
-            "Probabilidades": np.round(probs, 3),
-            "Próximo estado": proximo
-        })
+    # Mesmo loop de cima, com o dicionário convertido em tabela densa (m^K x m)
+    # e o contexto mantido como inteiro na base m
+    Q = tabela_de_dicionario(arvore, estados)
+    X = cache.simular(Q, pi, T, estados, [semente, 1])
 
     # -------------------------------------------
     # GRÁFICO DA TRAJETÓRIA (Cadeia de ordem K)
@@ -169,22 +165,9 @@ if sec == 'Dicionário':
 
     st.header("Trajetória Gerada pela Cadeia")
 
-    indices = list(range(T))
+    fig = cache.figura_trajetoria(X)
 
-    fig = px.scatter(
-        x=indices,
-        y=X,
-        text=X,
-        title=" ",
-        labels={"x": "Tempo (t)", "y": "Estado"},
-    )
-
-    fig.update_traces(
-        mode="lines+markers+text",
-        textposition="top center",
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    instrumentacao.grafico(fig, use_container_width=True)
 
     st.markdown("""Uma função que gera uma cadeia de markov aleatória de ordem k:""")
 
@@ -420,33 +403,16 @@ elif sec == "Árvore":
 
     pi = np.array([0.5, 0.3, 0.2])
 
-    X = [np.random.choice(estados, p=pi) for _ in range(K)]
+    semente = st.number_input("Semente", 0, 2 ** 32 - 1, 0)
 
-    for t in range(K, T):
-        contexto = tuple(X[-K:])
-        a, b, c = contexto
-        probs = arvore[a][b][c]
-        proximo = np.random.choice(estados, p=probs)
-        X.append(proximo)
+    Q = tabela_de_arvore(arvore, estados)
+    X = cache.simular(Q, pi, T, estados, semente)
 
     st.header("Trajetória Gerada pela Cadeia")
 
-    indices = list(range(T))
+    fig = cache.figura_trajetoria(X)
 
-    fig = px.scatter(
-        x=indices,
-        y=X,
-        text=X,
-        title=" ",
-        labels={"x": "Tempo (t)", "y": "Estado"},
-    )
-
-    fig.update_traces(
-        mode="lines+markers+text",
-        textposition="top center",
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    instrumentacao.grafico(fig, use_container_width=True)
 
 elif sec == "Simulação interativa":
 
@@ -507,31 +473,12 @@ elif sec == "Simulação interativa":
     st.divider()
     st.subheader("Árvore de Probabilidades")
 
+    # Uma linha por contexto (m^K linhas) numa única grade: editar e rodar de novo
+    # custa o mesmo para qualquer K. A grade já é a tabela densa Q usada na simulação.
+    # A página fica densa de propósito (K até 5, m^K linhas): árvores esparsas de
+    # contextos (markov.arvore.ArvoreContextos) existem só como biblioteca.
     contextos = list(itertools.product(estados, repeat=K))
-    arvore = {}
-
-    for ctx in contextos:
-        cols_row = st.columns(min(m, 4))
-
-        probs = []
-        for j in range(m):
-            with cols_row[j % 4]:
-                probs.append(
-                    st.number_input(
-                        f"P({ctx} → {estados[j]})",
-                        0.0, 1.0,
-                        1.0 / m,
-                        key=f"ctx_{'_'.join(ctx)}_{j}"
-                    )
-                )
-
-        probs = np.array(probs)
-        if probs.sum() == 0:
-            st.error(f"As probabilidades do contexto {ctx} não podem somar zero.")
-            st.stop()
-
-        probs = probs / probs.sum()
-        arvore[ctx] = probs
+    Q = editor_transicoes("Q", contextos, estados, nome_linhas="Contexto")
 
     # -----------------------------------------------------
 
@@ -541,35 +488,24 @@ elif sec == "Simulação interativa":
     st.divider()
     st.header("Simulação da Cadeia")
 
-    T = st.slider("Número de passos (T)", 5, 300, 20)
+    T = st.number_input("Número de passos (T)", 5, 1_000_000, 20)
+    semente = st.number_input("Semente", 0, 2 ** 32 - 1, 0)
 
-    # SORTEIO DOS K PRIMEIROS ESTADOS
-    X = []
-    for _ in range(K):
-        X.append(np.random.choice(estados, p=pi))
-
-    # SIMULAÇÃO
-    caminho_contextos = []
-
-    for t in range(K, T):
-        contexto = tuple(X[-K:])
-        probs = arvore[contexto]
-        proximo = np.random.choice(estados, p=probs)
-        caminho_contextos.append(str(contexto))
-        X.append(proximo)
+    # SIMULAÇÃO (K primeiros estados sorteados segundo π)
+    X = cache.simular(Q, pi, T, estados, semente)
 
     # -----------------------------------------------------
     # PLOT DA TRAJETÓRIA
     # -----------------------------------------------------
-    indices = list(range(T))
-    fig = px.scatter(
-        x=indices,
-        y=X,
-        text=X,
-        title="Trajetória da Cadeia de Ordem K",
-        labels={"x": "Tempo (t)", "y": "Estado"},
-    )
-    fig.update_traces(mode="lines+markers+text", textposition="top center")
-    st.plotly_chart(fig)
+    # Trajetórias longas: WebGL, e a janela escolhe o trecho desenhado em detalhe
+    janela = None
+    if T > LIMITE_TEXTO:
+        janela = st.slider("Janela de tempo", 0, T - 1, (0, T - 1),
+                           help="Diminua a janela para ver a trajetória com mais detalhe.")
+
+    fig = cache.figura_trajetoria(X, "Trajetória da Cadeia de Ordem K", janela)
+    instrumentacao.grafico(fig)
 
     # -----------------------------------------------------
+
+instrumentacao.painel()
@@ -4,6 +4,10 @@ import itertools
 import plotly.express as px
 import pandas as pd
 
+from markov import instrumentacao
+
+instrumentacao.iniciar_rerun()
+
 st.title("Verossimilhança de uma Cadeia de Markov")
 
 st.markdown("""
@@ -213,6 +217,40 @@ if sec == 'Estimador de Máxima Verossimilhança':
         language="python"
     )
 
+    st.markdown(r"""
+    Para sequências longas, o loop acima fica lento: a cada posição ele monta uma tupla e
+    consulta um dicionário. A versão usada no app (`markov.contagem`) faz a mesma conta de
+    forma vetorizada:
+
+    - os estados viram códigos inteiros $0, \dots, m-1$;
+    - cada contexto vira um inteiro na base $m$, calculado para todas as posições de uma vez;
+    - a matriz $N_{c,a}$ (uma linha por contexto) sai de um único `np.bincount`;
+    - $\ell = \sum N_{c,a} \log N_{c,a} - \sum_c N_c \log N_c$ é uma única expressão sobre essa matriz.
+    """)
+
+    st.code(
+        """
+    from scipy.special import xlogy  # xlogy(a, a) = a log a, com 0 log 0 = 0
+
+
+    def contar_transicoes(x, k, m):
+        # x: sequência codificada como inteiros 0..m-1
+        n = len(x) - k
+        contextos = np.zeros(n, dtype=np.int64)
+        for j in range(k):
+            contextos = contextos * m + x[j:j + n]
+
+        indices = contextos * m + x[k:]
+        return np.bincount(indices, minlength=m ** (k + 1)).reshape(m ** k, m)
+
+
+    def log_verossimilhanca_contagens(N):
+        N_c = N.sum(axis=1)
+        return (xlogy(N, N).sum() - xlogy(N_c, N_c).sum())
+        """,
+        language="python"
+    )
+
 
 
 
@@ -334,6 +372,64 @@ print(p_value)
         language="python"
     )
 
+    st.markdown(r"""
+    No loop acima, cada iteração recalcula $\ell_k$ e $\ell_{k+1}$ percorrendo a sequência inteira,
+    e o $\ell_{k+1}$ de uma iteração é o $\ell_k$ da seguinte. A versão usada no app
+    (`markov.ordem.teste_razao_verossimilhanca_ordem`) conta a sequência **uma única vez**, na ordem
+    $k_{max}$, e obtém as contagens das ordens menores somando sobre o estado mais antigo do contexto:
+
+    $$
+    N^{(k)}_{c,a} = \sum_{b \in \mathcal{A}} N^{(k+1)}_{bc,a} \; + \; \mathbb{1}\{(x_0, \dots, x_{k-1}) = c,\ x_k = a\},
+    $$
+
+    onde o último termo é a transição no instante $t = k$, que a contagem de ordem $k+1$ não vê.
+    Assim cada $\ell_k$ é calculado exatamente uma vez.
+    """)
+
+    st.markdown(r"""
+    ### Critérios de informação
+
+    Em vez de testes sequenciais entre ordens vizinhas, podemos comparar todas as ordens de uma vez
+    com critérios que penalizam o número de parâmetros $p_k$:
+
+    $$
+    \mathrm{AIC}_k = -2\,\ell_k + 2\,p_k,
+    \qquad
+    \mathrm{BIC}_k = -2\,\ell_k + p_k \log N,
+    $$
+
+    onde $N = n - k$ é o número de transições e $p_k = (m-1)\,m^k$ (ou $m-1$ vezes o número de
+    contextos observados). A ordem escolhida é a que minimiza o critério. Como os $\ell_k$ já
+    saem da mesma contagem, isso não exige nenhuma passada extra pela sequência:
+    """)
+
+    st.code("""
+from markov.ordem import criterios_informacao
 
+r = criterios_informacao(sequencia, k_min=0, k_max=5, parametros="completo")
 
+r["ordem_BIC"]                   # ordem que minimiza o BIC
+pd.DataFrame(r["resultados"])    # k, log_verossimilhanca, parametros, AIC, BIC
+            """, language="python")
+
+    st.markdown(r"""
+    ### Bootstrap paramétrico
+
+    A distribuição qui-quadrado com $(m-1)\,m^k$ graus de liberdade é só uma aproximação
+    assintótica, e fica ruim quando muitos contextos têm poucas observações. Uma alternativa é
+    o **bootstrap paramétrico**:
+
+    1. ajustar o EMV de ordem $k$ (a hipótese nula);
+    2. simular $B$ sequências do mesmo tamanho a partir dele;
+    3. recalcular a estatística $\mathrm{LR}_b$ em cada uma;
+    4. usar como p-valor $\dfrac{1 + \#\{b : \mathrm{LR}_b \ge \mathrm{LR}\}}{B + 1}$.
+    """)
+
+    st.code("""
+from markov.ordem import teste_razao_verossimilhanca_ordem
+
+# cada linha de "resultados" ganha "p_value_bootstrap" ao lado do "p_value" qui-quadrado
+teste_razao_verossimilhanca_ordem(sequencia, k_min=0, k_max=4, alpha=0.05, B=999, seed=0)
+            """, language="python")
 
+instrumentacao.painel()
@@ -1,14 +1,24 @@
 
+import os
+import sys
+
 import numpy as np
-import math
 from scipy.stats import chi2
 
+# Script avulso: `python "pages/Estimador MV.py"` só enxerga a pasta pages/, então a
+# raiz do repositório (onde está o pacote markov) entra no caminho de importação
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from markov.ordem import log_verossimilhancas
+from markov.trajetoria import Trajetoria
+
 #np.random.seed(42)
 
 estados = ["A", "B", "C"]
 n = 2000
 
-sequencia = list(np.random.choice(estados, size=n))
+# Códigos de 1 byte por passo, em vez de uma lista de np.str_
+sequencia = Trajetoria.de_rotulos(np.random.choice(estados, size=n), estados)
 
 k = 3
 
@@ -30,38 +40,15 @@ for estado in estados:
 
 
 
-def log_verossimilhanca_markov(sequencia, k):
-
-    # Calcula contagens
-    contagens_transicao = {}
-    total_contexto = {}
-
-    for t in range(k, len(sequencia)):
-        contexto = tuple(sequencia[t-k:t])
-        proximo_estado = sequencia[t]
-
-        if contexto not in contagens_transicao:
-            contagens_transicao[contexto] = {}
-            total_contexto[contexto] = 0
-
-        contagens_transicao[contexto][proximo_estado] = contagens_transicao[contexto].get(proximo_estado, 0) + 1
-        total_contexto[contexto] += 1
-    # calcula verossimilhança
-    ell = 0.0
-    for contexto, contagens in contagens_transicao.items(): # elementos do .items "Desempacota" Dicionário; não é um loop duplo!!!
-        Nk_c = total_contexto[contexto]
-        for Nk_ca in contagens.values():  # .values pega apenas a contagem
-            ell += Nk_ca * math.log(Nk_ca / Nk_c)
-
-    return ell
-
-# loops duplos acima correspondem a:
-# Para cada contexto c que apareceu na sequência,
-# para cada estado 𝑎 tal que 𝑁𝑐,𝑎 > 0
-# somar 𝑁𝑐,𝑎 * log⁡(𝑁𝑐,𝑎/𝑁𝑐)
+# A contagem com dicionários (um tuple(sequencia[t-k:t]) por posição) foi trocada
+# pela versão vetorizada em markov.contagem: a sequência vira códigos inteiros,
+# os contextos são calculados de uma vez e N_{c,a} sai de um único bincount.
+# A log-verossimilhança continua sendo
+# Σ_c Σ_a N_{c,a} * log(N_{c,a} / N_c), agora numa expressão sobre a matriz de contagens.
 
-ell_k   = log_verossimilhanca_markov(sequencia, k)
-ell_k1  = log_verossimilhanca_markov(sequencia, k+1)
+# ℓ_k e ℓ_{k+1} saem da mesma contagem (a de ordem k+1, marginalizada para ordem k)
+ell = log_verossimilhancas(sequencia.codigos, k+1, sequencia.m)
+ell_k, ell_k1 = ell[k], ell[k+1]
 
 LR = 2 * (ell_k1 - ell_k)
 